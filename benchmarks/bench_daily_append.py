@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# Time of the daily job of fetch_dsebd_data.py- append_all_stock_data() on
+# the saved DSE price board of 400 symbols, against the length of the
+# stored history. The optional rewrite of the history files is timed on
+# one year of history.
+# Run from the repository root- python -m benchmarks.bench_daily_append
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import fetch_dsebd_data
+from benchmarks.fixtures import FixtureClient
+from stocksurferbd_pkg import PriceStore
+
+
+# (history years, rewrite the history files)
+CASES = ((1, False), (2, False), (4, False), (8, False), (1, True))
+REPEAT = 5
+
+
+def make_history(symbols, dates):
+    n = len(symbols) * len(dates)
+    close = np.random.uniform(10, 500, n)
+    return pd.DataFrame({
+        'DATE': np.repeat(dates, len(symbols)),
+        'TRADING_CODE': np.tile(symbols, len(dates)),
+        'LTP': close,
+        'HIGH': close * 1.02,
+        'LOW': close * 0.98,
+        'OPENP': close,
+        'CLOSEP': close,
+        'YCP': close,
+        'TRADE': np.random.randint(1, 5000, n),
+        'VALUE_MN': np.random.uniform(0, 90, n),
+        'VOLUME': np.random.randint(1, 900000, n),
+    })
+
+
+def time_job(update_files=False):
+    timings = []
+    for _ in range(1 if update_files else REPEAT):
+        start = time.perf_counter()
+        fetch_dsebd_data.append_all_stock_data(update_files=update_files)
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1000
+
+
+def run():
+    loader = fetch_dsebd_data.loader
+    loader.client = FixtureClient()
+    symbols = loader.get_current_data(market='DSE', output='frame')['TRADING_CODE']
+    # the saved price board is of 2024-05-02
+    end_date = '2024-04-30'
+    cwd = os.getcwd()
+    print(f'{"history years":13s} | {"history rows":>12s} | {"files":>5s} | job time (ms)')
+    for years, update_files in CASES:
+        root_path = tempfile.mkdtemp()
+        try:
+            os.chdir(root_path)
+            dates = pd.bdate_range(end=end_date, periods=250 * years)
+            df_history = make_history(symbols.to_numpy(), dates)
+            PriceStore(fetch_dsebd_data.HISTORY_STORE).write(df_history)
+            if update_files:
+                os.makedirs(fetch_dsebd_data.HISTORY_FOLDER)
+                for sym, df_symbol in df_history.groupby('TRADING_CODE'):
+                    loader.save_data(df_symbol, fetch_dsebd_data.get_history_file(sym))
+            job_time = time_job(update_files)
+            print(
+                f'{years:13d} | {len(df_history):12d} | '
+                f'{"yes" if update_files else "no":>5s} | {job_time:13.1f}'
+            )
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(root_path)
+
+
+if __name__ == '__main__':
+    run()
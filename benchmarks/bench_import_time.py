@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# Import time of the package, measured with `python -X importtime` in a
+# fresh interpreter for every import statement.
+# Run from the repository root- python -m benchmarks.bench_import_time
+# Exits with 1 when a statement loads a library it shouldn't need or
+# takes longer than `--max-ms`.
+
+import argparse
+import subprocess
+import sys
+
+
+# import statement -> libraries it must not load
+IMPORTS = {
+    'import stocksurferbd_pkg': (
+        'pandas', 'matplotlib', 'mplfinance', 'bs4', 'requests',
+    ),
+    'from stocksurferbd_pkg import PriceData': ('matplotlib', 'mplfinance', 'bs4', 'httpx'),
+    'from stocksurferbd_pkg import FundamentalData': ('matplotlib', 'mplfinance', 'bs4', 'httpx'),
+    'from stocksurferbd_pkg import PriceStore': ('matplotlib', 'mplfinance', 'bs4', 'requests'),
+    'from stocksurferbd_pkg import CandlestickPlot': ('matplotlib', 'mplfinance', 'bs4'),
+}
+REPEAT = 5
+
+
+def get_import_times(statement):
+    """
+    Cumulative import time in microseconds of every module imported at
+    the top level by `statement`, and the names of all loaded modules.
+    """
+    code = f'{statement}\nimport sys\nprint(",".join(sys.modules))'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, check=True
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # nested imports are indented below the module importing them
+        if name.startswith('  '):
+            continue
+        import_times[name.strip()] = int(cumulative)
+    return import_times, set(result.stdout.strip().split(','))
+
+
+def measure(statement, repeat):
+    base_times, base_modules = get_import_times('pass')
+    timings = []
+    for _ in range(repeat):
+        import_times, modules = get_import_times(statement)
+        timings.append(sum(
+            t for name, t in import_times.items() if name not in base_times
+        ) / 1000)
+    return sorted(timings)[len(timings) // 2], modules - base_modules
+
+
+def run(argv=None):
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--repeat', type=int, default=REPEAT)
+    arg_parser.add_argument('--max-ms', type=float, default=None)
+    args = arg_parser.parse_args(argv)
+
+    failed = False
+    print(f'{"statement":48s} | {"time (ms)":>9s} | unwanted libraries')
+    for statement, unwanted in IMPORTS.items():
+        median_ms, modules = measure(statement, args.repeat)
+        loaded = [name for name in unwanted if name in modules]
+        too_slow = args.max_ms is not None and median_ms > args.max_ms
+        failed = failed or bool(loaded) or too_slow
+        print(
+            f'{statement:48s} | {median_ms:9.1f} | '
+            f'{", ".join(loaded) or "-"}{" SLOW" if too_slow else ""}'
+        )
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
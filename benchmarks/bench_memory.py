@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# Memory held by the parsed rows of a market-wide DSE archive page for
+# each parser output- row dicts, typed DataFrame and PriceBars.
+# Run from the repository root- python -m benchmarks.bench_memory
+
+import gc
+import sys
+import tracemalloc
+
+from benchmarks.fixtures import SYMBOLS, FixtureClient, dse_archive_page
+
+
+DAYS = 60
+
+
+def retained_bytes(func):
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, len(result)
+
+
+def run():
+    from stocksurferbd_pkg import PriceData
+
+    client = FixtureClient()
+    client.pages['day_end_archive.php'] = dse_archive_page(symbols=SYMBOLS, days=DAYS)
+    loader = PriceData(client=client, html_backend='lxml')
+
+    print(f'{"output":8s} | {"rows":>7s} | {"MB":>7s} | bytes/row')
+    for output in ('list', 'frame', 'bars'):
+        size, rows = retained_bytes(
+            lambda: loader.parse_price_history_dse('All Instrument', output=output)
+        )
+        print(f'{output:8s} | {rows:7d} | {size / 2 ** 20:7.2f} | {size / rows:9.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
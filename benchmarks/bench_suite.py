@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# Offline benchmarks of parsing, storage, indicators and plotting.
+# Run from the repository root-
+#   python -m benchmarks.bench_suite --save results/base.json
+#   python -m benchmarks.bench_suite --compare results/base.json
+# `--compare` exits with 1 when a benchmark got slower than `--threshold`.
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import FixtureClient, make_ohlcv
+
+
+def parse_cases():
+    from stocksurferbd_pkg import FundamentalData, PriceData
+
+    client = FixtureClient()
+    cases = {}
+    for backend in ('bs4', 'lxml'):
+        try:
+            loader = PriceData(client=client, html_backend=backend)
+            company_loader = FundamentalData(client=client, html_backend=backend)
+        except ImportError:
+            continue
+        cases.update({
+            f'parse/dse_archive/{backend}': lambda loader=loader: loader.parse_price_history_dse('ACI'),
+            f'parse/dse_archive_frame/{backend}': lambda loader=loader: loader.parse_price_history_dse(
+                'ACI', output='frame'
+            ),
+            f'parse/dse_archive_bars/{backend}': lambda loader=loader: loader.parse_price_history_dse(
+                'ACI', output='bars'
+            ),
+            f'parse/dse_latest/{backend}': lambda loader=loader: loader.get_current_data('DSE'),
+            f'parse/cse_current/{backend}': lambda loader=loader: loader.get_current_data('CSE'),
+            f'parse/dse_company/{backend}': lambda company_loader=company_loader: (
+                company_loader.get_company_frames('ACI')
+            ),
+        })
+    loader = PriceData(client=client)
+    cases['parse/cse_graph'] = lambda: loader.parse_price_history_cse('ACI')
+    cases['parse/cse_graph_frame'] = lambda: loader.parse_price_history_cse('ACI', output='frame')
+    return cases
+
+
+def storage_cases(tmp_dir):
+    from stocksurferbd_pkg.stocksurferbd.storage import HISTORY_FORMATS, get_storage
+
+    df = make_ohlcv(years=8)
+    cases = {}
+    for format in HISTORY_FORMATS:
+        storage = get_storage(format, history=True)
+        path = os.path.join(tmp_dir, 'history' + storage.extension)
+        try:
+            storage.write(df, path)
+        except ImportError:
+            continue
+        cases[f'storage/write/{format}'] = (
+            lambda storage=storage, path=path: storage.write(df, path)
+        )
+        cases[f'storage/read/{format}'] = lambda storage=storage, path=path: storage.read(path)
+    return cases
+
+
+def archive_cases(tmp_dir):
+    from stocksurferbd_pkg import PriceArchive
+
+    archive = PriceArchive(os.path.join(tmp_dir, 'archive'))
+    archive.write(make_ohlcv(years=8))
+    return {
+        'archive/window_120': lambda: archive.get_window('SYM000', end_date='2020-06-30', n=120),
+        'archive/read_bars': lambda: archive.read_bars('SYM000', '2019-01-01', '2019-12-31'),
+        'archive/read_symbol': lambda: archive.read_symbol('SYM000'),
+    }
+
+
+def indicator_cases():
+    from stocksurferbd_pkg.stocksurferbd import indicators
+    from stocksurferbd_pkg.stocksurferbd.resampler import Resampler, to_ohlc_frame
+
+    df = make_ohlcv(years=8)
+    close, high, low = df['CLOSEP'], df['HIGH'], df['LOW']
+    daily = to_ohlc_frame(df)
+    return {
+        'indicators/bollinger': lambda: indicators.bollinger_bands(close, 10),
+        'indicators/rsi': lambda: indicators.rsi(close, 14),
+        'indicators/macd': lambda: indicators.macd(close, 12, 26, 9),
+        'indicators/fractals': lambda: indicators.fractals(high, low),
+        'resample/W': lambda: Resampler.resample(daily, 'W'),
+        'resample/M': lambda: Resampler.resample(daily, 'M'),
+    }
+
+
+def plot_cases(tmp_dir):
+    from stocksurferbd_pkg.stocksurferbd.price_plots import use_agg_backend
+
+    use_agg_backend()
+    from matplotlib import pyplot as plt
+
+    from stocksurferbd_pkg import CandlestickPlot
+
+    path = os.path.join(tmp_dir, 'plot_history.parquet')
+    try:
+        make_ohlcv(years=8).to_parquet(path, index=False)
+    except ImportError:
+        path = os.path.join(tmp_dir, 'plot_history.csv')
+        make_ohlcv(years=8).to_csv(path, index=False)
+
+    def render(step):
+        fig, _ = CandlestickPlot(path, 'SYM000').get_candlestick_fig(
+            data_n=120, resample=step != '1D', step=step
+        )
+        plt.close(fig)
+
+    return {
+        'plot/1D': lambda: render('1D'),
+        'plot/W': lambda: render('W'),
+    }
+
+
+def time_case(func, repeat):
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'median_ms': float(np.median(timings) * 1000),
+        'min_ms': float(np.min(timings) * 1000),
+        'repeat': repeat,
+    }
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f'\n{"benchmark":40s} | {"base (ms)":>10s} | {"now (ms)":>10s} | ratio')
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base_ms = baseline[name]['median_ms']
+        ratio = result['median_ms'] / base_ms if base_ms else float('inf')
+        flag = ' SLOWER' if ratio > threshold else ''
+        print(f'{name:40s} | {base_ms:10.2f} | {result["median_ms"]:10.2f} | {ratio:5.2f}{flag}')
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def run(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--repeat', type=int, default=10)
+    arg_parser.add_argument('--filter', default='', help='run the benchmarks whose name contains this')
+    arg_parser.add_argument('--save', help='save the results to this JSON file')
+    arg_parser.add_argument('--compare', help='compare with the results of this JSON file')
+    arg_parser.add_argument('--threshold', type=float, default=1.2)
+    args = arg_parser.parse_args(argv)
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        cases = {}
+        cases.update(parse_cases())
+        cases.update(storage_cases(tmp_dir))
+        cases.update(archive_cases(tmp_dir))
+        cases.update(indicator_cases())
+        cases.update(plot_cases(tmp_dir))
+
+        results = {}
+        print(f'{"benchmark":40s} | {"median (ms)":>11s} | {"min (ms)":>10s}')
+        for name, func in cases.items():
+            if args.filter not in name:
+                continue
+            results[name] = time_case(func, args.repeat)
+            print(f'{name:40s} | {results[name]["median_ms"]:11.2f} | {results[name]["min_ms"]:10.2f}')
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    if args.save:
+        save_dir = os.path.dirname(args.save)
+        if save_dir:
+            os.makedirs(save_dir, exist_ok=True)
+        with open(args.save, 'w') as results_file:
+            json.dump({
+                'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+                'results': results,
+            }, results_file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
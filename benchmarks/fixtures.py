@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# Offline pages and price data for the benchmarks and tests.
+#
+# The DSE/CSE pages of one symbol are kept in benchmarks/fixtures/ and
+# served by FixtureClient. A synthetic archive page of many symbols is
+# generated for the market-wide cases.
+#
+# The committed pages are SYNTHETIC. They were written by hand in the
+# markup of the DSE/CSE pages because the sites couldn't be reached, and
+# cse_graph.html was shaped so the old split parser accepts it. Tests on
+# them only show that the parsers agree on this markup, not on the live
+# pages. Replace them with real captures before treating the parity
+# tests as evidence- python -m benchmarks.fixtures ACI
+# record() also writes a RECORDED file with the date and URLs, which
+# is_recorded() checks.
+
+import datetime
+import os
+import random
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RECORDED_FILE = os.path.join(FIXTURE_DIR, 'RECORDED')
+SYMBOLS = [f'SYM{i:03d}' for i in range(400)]
+
+
+def format_number(value):
+    return f'{value:,.2f}'
+
+
+def dse_archive_page(symbols=('ACI',), days=250, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    row_no = 1
+    date = datetime.date(2024, 1, 1)
+    for _ in range(days):
+        date += datetime.timedelta(days=1)
+        for symbol in symbols:
+            close = rng.uniform(10, 500)
+            rows.append(
+                f'<tr>\n <td>{row_no}</td>\n <td>{date}</td>\n'
+                f' <td><a href="displayCompany.php?name={symbol}">\n {symbol} </a></td>\n'
+                + ''.join(
+                    f' <td>{format_number(close * k)}</td>\n'
+                    for k in (1, 1.02, 0.98, 1, 1, 0.99)
+                )
+                + f' <td>{rng.randint(1, 5000):,}</td>\n'
+                f' <td>{format_number(rng.uniform(0, 90))}</td>\n'
+                f' <td>{rng.randint(1, 900000):,}</td>\n</tr>'
+            )
+            row_no += 1
+    return (
+        '<html><body>'
+        '<table class="table table-bordered background-white shares-table fixedHeader">'
+        '<thead><tr><th>#</th><th>DATE</th><th>TRADING CODE</th></tr></thead>'
+        f'<tbody>{"".join(rows)}</tbody></table></body></html>'
+    )
+
+
+def is_recorded():
+    # the pages were saved from the live sites by record()
+    return os.path.exists(RECORDED_FILE)
+
+
+def read_recorded(name):
+    # newline='' keeps the line endings of the saved page
+    path = os.path.join(FIXTURE_DIR, name)
+    with open(path, 'r', encoding='utf-8', newline='') as fixture_file:
+        return fixture_file.read()
+
+
+class FixtureClient(object):
+    """
+    Stands in for HttpClient and serves the saved pages by URL, so the
+    benchmarks and tests never touch the network.
+    """
+    PAGES = {
+        'day_end_archive.php': 'dse_archive.html',
+        'latest_share_price': 'dse_latest.html',
+        'cbul.php': 'dse_cbul.html',
+        'current_price': 'cse_current.html',
+        'company_graph_6m': 'cse_graph.html',
+        'displayCompany.php': 'dse_company.html',
+    }
+
+    def __init__(self):
+        self.pages = {
+            pattern: read_recorded(name) for pattern, name in self.PAGES.items()
+        }
+
+    def get_text(self, url):
+        for pattern, page in self.pages.items():
+            if pattern in url:
+                return page
+        raise IOError(f'No fixture for {url}')
+
+
+def make_ohlcv(years=8, seed=5):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end='2024-12-30', periods=250 * years)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+    return pd.DataFrame({
+        'DATE': dates,
+        'TRADING_CODE': 'SYM000',
+        'LTP': close,
+        'HIGH': close * 1.02,
+        'LOW': close * 0.98,
+        'OPENP': close * rng.uniform(0.99, 1.01, len(dates)),
+        'CLOSEP': close,
+        'YCP': np.roll(close, 1),
+        'TRADE': rng.integers(1, 5000, len(dates)),
+        'VALUE_MN': rng.uniform(0, 90, len(dates)),
+        'VOLUME': rng.integers(1, 900000, len(dates)),
+    })
+
+
+def record(symbol='ACI'):
+    from stocksurferbd_pkg import FundamentalData, HttpClient, PriceData
+
+    client = HttpClient()
+    urls = {
+        'dse_archive.html': (
+            PriceData().get_history_url(
+                start_date=datetime.date.today() - datetime.timedelta(days=365)
+            ) + '&inst=' + symbol
+        ),
+        'dse_latest.html': PriceData.CURRENT_PRICE_URL_DSE,
+        'dse_cbul.html': PriceData.CKT_BREAKER_URL_DSE,
+        'cse_current.html': PriceData.CURRENT_PRICE_URL_CSE,
+        'cse_graph.html': PriceData.HISTORY_URL_CSE + symbol,
+        'dse_company.html': FundamentalData.DSE_COMPANY_URL + symbol,
+    }
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, url in urls.items():
+        with open(
+            os.path.join(FIXTURE_DIR, name), 'w', encoding='utf-8', newline=''
+        ) as fixture_file:
+            fixture_file.write(client.get_text(url))
+        print(f'{name} <- {url}')
+    with open(RECORDED_FILE, 'w', encoding='utf-8') as recorded_file:
+        recorded_file.write(f'{datetime.date.today()}\n')
+        recorded_file.writelines(f'{name} <- {url}\n' for name, url in urls.items())
+
+
+if __name__ == '__main__':
+    record(*sys.argv[1:2])
@@ -19,15 +19,15 @@ def fetch_all_stock_data():
     loader.save_current_data(file_name=CUR_FILE_NAME, market='CSE')
     df = pd.read_csv(CUR_FILE_NAME)
     symbols = df['TRADING_CODE'].values
-    for sym in symbols:
-        print('Downloading ' + sym + " data.....")
-        try:
-            loader.save_history_data(
-                symbol=sym, file_path='cse_history_data', file_name=sym + '_history_data.xlsx', market='CSE'
-            )
-            print('Downloading ' + sym + " Finished!")
-        except Exception as e:
-            print("ERROR: " + str(e))
+    results = loader.save_history_data_bulk(
+        symbols,
+        file_path='cse_history_data',
+        file_name='{symbol}_history_data.xlsx',
+        market='CSE'
+    )
+    for sym, result in results.items():
+        if result['status'] == 'error':
+            print(sym + " ERROR: " + result['error'])
     print('Data extraction finished')
 
 
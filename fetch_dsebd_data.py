@@ -4,88 +4,99 @@ __author__ = "Sk Farhad"
 __copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
 
 import os
-import sys
+
 import pandas as pd
 
-from stocksurferbd_pkg import PriceData
+from stocksurferbd_pkg import MetricsCollector, PriceData, PriceStore
 
 
 CUR_FILE_NAME = 'dsebd_current_data.xlsx'
 HISTORY_FOLDER = 'dse_history_data'
+HISTORY_SUFFIX = '_history_data.xlsx'
+HISTORY_FILE = '{symbol}' + HISTORY_SUFFIX
+HISTORY_STORE = 'dse_price_store'
+METRICS_FILE = 'dse_fetch_metrics.json'
+HISTORY_COLUMNS = [
+    'DATE', 'TRADING_CODE', 'LTP', 'HIGH', 'LOW', 'OPENP', 'CLOSEP', 'YCP',
+    'TRADE', 'VALUE_MN', 'VOLUME'
+]
 
 
-loader = PriceData()
-
-
-def append_historical_data(symbol, df_cur, csv_path=''):
-    csv_path = os.path.join(csv_path, symbol + "_history_data.xlsx")
-    df_history = pd.read_csv(
-        csv_path,
-        sep=r'\s*,\s*',
-        header=0,
-        encoding='ascii',
-        engine='python',
-    )
-    dates = df_history['DATE'].values
-    # print(df_history.head())
-    latest_date = df_cur[df_cur['TRADING_CODE'] == symbol]['DATE'].values[0]
-    cur_row = df_cur[df_cur['TRADING_CODE'] == symbol]
-    data_dict = {
-        'DATE': latest_date,
-        'TRADING_CODE': symbol,
-        'LTP': cur_row['LTP'].values[0],
-        'HIGH': cur_row['HIGH'].values[0],
-        'LOW': cur_row['LOW'].values[0],
-        'OPENP': cur_row['LTP'].values[0],
-        'CLOSEP': cur_row['LTP'].values[0],
-        'YCP': cur_row['YCP'].values[0],
-        'TRADE': cur_row['TRADE'].values[0],
-        'VALUE_MN': cur_row['VALUE_MN'].values[0],
-        'VOLUME': cur_row['VOLUME'].values[0],
-    }
-    if latest_date not in dates:
-        df_history = df_history.append(
-            data_dict,
-            ignore_index=True
-        )
-    else:
-        df_history.loc[df_history['DATE'] == latest_date, data_dict.keys()] = data_dict.values()
-
-    df_history['DATE'] = pd.to_datetime(df_history['DATE'])
-    df_history.sort_values(by='DATE', inplace=True)
-    df_history.reset_index(inplace=True)
-    del df_history['index']
-    df_history.to_csv(csv_path, index=False)
+metrics = MetricsCollector()
+loader = PriceData(metrics=metrics)
 
 
 def fetch_all_stock_data():
     loader.save_current_data(file_name=CUR_FILE_NAME)
     df = pd.read_excel(CUR_FILE_NAME)
     symbols = df['TRADING_CODE'].values
-    for sym in symbols:
-        print('Downloading ' + sym + " data.....")
-        try:
-            loader.save_history_data(
-                sym, file_path=HISTORY_FOLDER, file_name=sym + '_history_data.xlsx'
-            )
-            print('Downloading ' + sym + " Finished!")
-        except Exception as e:
-            print("ERROR: " + str(e))
+    results = loader.save_history_data_bulk(
+        symbols,
+        file_path=HISTORY_FOLDER,
+        file_name=HISTORY_FILE,
+        market='DSE'
+    )
+    for sym, result in results.items():
+        if result['status'] == 'error':
+            print(sym + " ERROR: " + result['error'])
+    # the daily append extends the store, so it starts from the full history
+    symbols = [sym for sym, result in results.items() if result['status'] == 'ok']
+    rows = import_history_files(symbols)
+    metrics.to_json(METRICS_FILE)
+    print(str(rows) + ' rows written to ' + HISTORY_STORE)
     print('Data extraction finished')
 
 
-def append_all_stock_data():
-    loader.save_current_data(file_name=CUR_FILE_NAME)
-    df_cur = pd.read_excel(CUR_FILE_NAME)
-    symbols = df_cur['TRADING_CODE'].values
-    for sym in symbols:
-        print('Appending ' + sym + " data.....")
-        try:
-            append_historical_data(sym, df_cur, csv_path=HISTORY_FOLDER)
-            print('Appending ' + sym + " Finished!")
-        except Exception as e:
-            print(sym + " ERROR: " + str(e))
-    print('Data extraction finished')
+def get_history_file(symbol):
+    return os.path.join(HISTORY_FOLDER, HISTORY_FILE.format(symbol=symbol))
+
+
+def import_history_files(symbols):
+    frames = [
+        loader.load_data(get_history_file(sym)) for sym in symbols
+        if os.path.exists(get_history_file(sym))
+    ]
+    if not frames:
+        return 0
+    store = PriceStore(HISTORY_STORE)
+    return store.write(pd.concat(frames, ignore_index=True), market='DSE')
+
+
+def update_history_files(store, symbols):
+    # rewrites the full history file of every symbol that has one, run it
+    # for the symbols to be plotted with CandlestickPlot
+    symbols = [sym for sym in symbols if os.path.exists(get_history_file(sym))]
+    if not symbols:
+        return
+    df = store.read(market='DSE', symbols=symbols).reset_index()
+    for sym, df_symbol in df.groupby('TRADING_CODE', sort=False, observed=True):
+        df_symbol = df_symbol.sort_values('DATE', ascending=False)
+        loader.save_data(
+            df_symbol[HISTORY_COLUMNS].reset_index(drop=True), get_history_file(sym)
+        )
+
+
+def append_all_stock_data(update_files=False):
+    store = PriceStore(HISTORY_STORE)
+    if not store.get_years(market='DSE') and os.path.isdir(HISTORY_FOLDER):
+        # history saved by an earlier full fetch
+        import_history_files([
+            name[:-len(HISTORY_SUFFIX)] for name in os.listdir(HISTORY_FOLDER)
+            if name.endswith(HISTORY_SUFFIX)
+        ])
+    current_data = loader.get_current_data(market='DSE', output='frame')
+    rows = loader.append_current_data(store, market='DSE', current_data=current_data)
+    print(str(rows) + ' rows appended')
+    if update_files:
+        update_history_files(store, current_data['TRADING_CODE'].unique())
+
+
+def backfill_all_stock_data(start_date, end_date=None):
+    store = PriceStore(HISTORY_STORE)
+    rows = loader.save_market_history_data(
+        start_date, end_date=end_date, store=store
+    )
+    print(str(rows) + ' rows written')
 
 
 if __name__ == "__main__":
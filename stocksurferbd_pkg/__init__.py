@@ -3,7 +3,16 @@
 __author__ = "Sk Farhad"
 __copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
 
+from .stocksurferbd.lazy_import import lazy_getattr
+from .stocksurferbd import LAZY_EXPORTS
 
-from .stocksurferbd import PriceData
-from .stocksurferbd import FundamentalData
-from .stocksurferbd import CandlestickPlot
+
+__all__ = list(LAZY_EXPORTS)
+
+__getattr__ = lazy_getattr(__name__, {
+    name: '.stocksurferbd' for name in LAZY_EXPORTS
+})
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
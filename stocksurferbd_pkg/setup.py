@@ -28,9 +28,12 @@ setuptools.setup(
         'beautifulsoup4==4.9.3',
         'matplotlib==3.9.2',
         'mplfinance==0.12.10b0',
-        'pyti==0.2.2',
-        'tapy==1.9.1',
     ],
+    extras_require={
+        'lxml': ['lxml>=4.9'],
+        'parquet': ['pyarrow>=14.0'],
+        'async': ['httpx>=0.24'],
+    },
     packages=['stocksurferbd'],
     python_requires=">=3.10",
     zip_safe=False
@@ -3,7 +3,38 @@
 __author__ = "Sk Farhad"
 __copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
 
+from .lazy_import import lazy_getattr
 
-from .price_data_scraper import PriceData
-from .fundamental_data_scraper import FundamentalData
-from .price_plots import CandlestickPlot
+
+# Every public name is imported from its module on first use, so that
+# e.g. `from stocksurferbd import PriceData` doesn't load matplotlib.
+LAZY_EXPORTS = {
+    'PriceData': '.price_data_scraper',
+    'FundamentalData': '.fundamental_data_scraper',
+    'CandlestickPlot': '.price_plots',
+    'IndicatorCache': '.price_plots',
+    'StreamingEMA': '.indicators',
+    'StreamingMACD': '.indicators',
+    'StreamingRSI': '.indicators',
+    'StreamingBollinger': '.indicators',
+    'StreamingFractals': '.indicators',
+    'HttpClient': '.http_client',
+    'AsyncHttpClient': '.http_client',
+    'PriceStore': '.price_store',
+    'ResponseCache': '.http_cache',
+    'PricePoller': '.price_poller',
+    'TickStore': '.price_poller',
+    'Resampler': '.resampler',
+    'MetricsCollector': '.metrics',
+    'Screener': '.screener',
+    'PriceBars': '.price_bars',
+    'PriceArchive': '.price_archive',
+}
+
+__all__ = list(LAZY_EXPORTS)
+
+__getattr__ = lazy_getattr(__name__, LAZY_EXPORTS)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,17 +3,61 @@
 __author__ = "Sk Farhad"
 __copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
-from bs4 import BeautifulSoup
-import requests
 from dateutil import parser
 
+from .http_client import AsyncHttpClient, HttpClient, RateLimiter
+from .html_backends import BS4Backend, get_html_backend
+from .metrics import MetricsCollector
+from .storage import get_storage
+
 
 class FundamentalData(object):
     DSE_COMPANY_URL = "https://dsebd.org/displayCompany.php?name="
     CURRENT_PRICE_URL = 'https://www.dsebd.org/dseX_share.php'
 
+    def __init__(
+        self,
+        client=None,
+        html_backend='bs4',
+        cache=None,
+        metrics=None,
+        async_client=None,
+    ):
+        if metrics is None:
+            metrics = (
+                getattr(client, 'metrics', None)
+                or getattr(async_client, 'metrics', None)
+                or MetricsCollector()
+            )
+        self.metrics = metrics
+        self.client = client if client is not None else HttpClient(
+            cache=cache, metrics=metrics
+        )
+        self.async_client = async_client
+        self.own_async_client = False
+        self.html_backend = get_html_backend(html_backend)
+
+    def get_async_client(self):
+        # made on first use of an `afetch_*` method, httpx is optional
+        if self.async_client is None:
+            self.async_client = AsyncHttpClient(
+                cache=getattr(self.client, 'cache', None), metrics=self.metrics
+            )
+            self.own_async_client = True
+        return self.async_client
+
+    def reset_async_client(self):
+        # drops the async client made by get_async_client(), the next
+        # `afetch_*` call makes a new one
+        if self.own_async_client:
+            self.async_client = None
+            self.own_async_client = False
+
     @staticmethod
     def parse_float(str_val):
         new_val = str_val.replace(
@@ -164,39 +208,43 @@ class FundamentalData(object):
         return df_fin_perf
 
     @staticmethod
-    def parse_company_data_rows(soup, symbol):
-
+    def parse_company_data_rows(soup, symbol, html_backend=None, metrics=None):
+        html = html_backend if html_backend is not None else BS4Backend()
         company_info = {}
         fin_perf_info = {}
         fin_interim_info = {}
-        agm_info = soup.find(
+        agm_info = html.find(
+            soup,
             "div",
-            attrs={
+            {
                 "class": "col-sm-6 pull-left"
             }
         )
         if agm_info is None:
             raise Exception(f"Data fetch error for: {symbol}")
         # print("AGM info: " + str(agm_info))
-        date_txt = " ".join(agm_info.text.split('on:')[1].strip().split())
+        date_txt = " ".join(html.get_text(agm_info).split('on:')[1].strip().split())
         try:
             last_agm_date = parser.parse(date_txt).date()
         except Exception as e:
-            print(str(e))
+            if metrics is not None:
+                metrics.add('agm_date_errors')
+                metrics.record_failure(symbol, e)
             last_agm_date = 'None'
 
-        company_tables = soup.find_all(
+        company_tables = html.find_all(
+            soup,
             "table",
-            attrs={
+            {
                 "class": "table table-bordered background-white",
             }
         )
         count = 1
         for table in company_tables:
-            table_rows = table.find_all("tr")
+            table_rows = html.table_rows(table)
             cur_list = []
-            for row in table_rows:
-                row_data = [" ".join(td.get_text().split()) for td in row.find_all("td")]
+            for _, td_texts in table_rows:
+                row_data = [" ".join(td.split()) for td in td_texts]
                 cur_list.append(row_data)
             if count == 1:
                 company_info.update({
@@ -259,30 +307,140 @@ class FundamentalData(object):
 
         return dict_company, dict_fin_perf
 
-    def get_company_df(self, symbol):
-        df_company_all = pd.DataFrame()
-        df_fin_perf_all = pd.DataFrame()
+    def get_company_frames(self, symbol):
         full_url = self.DSE_COMPANY_URL + symbol
-        target_page = requests.get(full_url)
-        page_html = BeautifulSoup(target_page.text, 'html.parser')
-        dict_company, dict_fin_perf = self.parse_company_data_rows(
-            page_html, symbol
-        )
-        df_company = self.append_company(
-            company_info=dict_company['company_info'],
-            fin_interim_info=dict_company['fin_interim_info'],
-            symbol=symbol
-        )
-        df_company_all = pd.concat([df_company_all, df_company])
-        df_fin_perf = self.append_fin_perf(
-            fin_perf_info=dict_fin_perf['fin_perf_info'],
-            symbol=symbol
+        page_text = self.client.get_text(full_url)
+        return self.parse_company_page(page_text, symbol)
+
+    def parse_company_page(self, page_text, symbol):
+        with self.metrics.stage('parse'):
+            page_html = self.html_backend.load(page_text)
+            dict_company, dict_fin_perf = self.parse_company_data_rows(
+                page_html, symbol, html_backend=self.html_backend,
+                metrics=self.metrics
+            )
+        with self.metrics.stage('convert'):
+            df_company = self.append_company(
+                company_info=dict_company['company_info'],
+                fin_interim_info=dict_company['fin_interim_info'],
+                symbol=symbol
+            )
+            df_fin_perf = self.append_fin_perf(
+                fin_perf_info=dict_fin_perf['fin_perf_info'],
+                symbol=symbol
+            )
+        return df_company, df_fin_perf
+
+    def get_company_df(self, symbol):
+        df_company, df_fin_perf = self.get_company_frames(symbol)
+        self.metrics.add('companies_downloaded')
+        return df_company, df_fin_perf
+
+    def get_company_data_bulk(self, symbols, max_workers=8, rate_limit=2):
+        """
+        Download company pages of many symbols in parallel.
+
+        Returns the company snapshot of all symbols and their year-wise
+        financial performance as two DataFrames, plus a dict of
+        symbol -> error message for the symbols that failed.
+        """
+        limiter = RateLimiter(rate_limit)
+
+        def get_symbol_frames(symbol):
+            limiter.wait()
+            return self.get_company_frames(symbol)
+
+        frames, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(get_symbol_frames, symbol): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    frames[symbol] = future.result()
+                except Exception as e:
+                    self.metrics.record_failure(symbol, e)
+                    errors[symbol] = str(e)
+
+        return self.concat_company_frames(symbols, frames, errors)
+
+    @staticmethod
+    def concat_company_frames(symbols, frames, errors):
+        ordered = [frames[symbol] for symbol in symbols if symbol in frames]
+        if not ordered:
+            return pd.DataFrame(), pd.DataFrame(), errors
+        df_company = pd.concat([f[0] for f in ordered], ignore_index=True)
+        df_fin_perf = pd.concat([f[1] for f in ordered], ignore_index=True)
+        return df_company, df_fin_perf, errors
+
+    async def afetch_company(self, symbol):
+        """
+        Async `get_company_frames()`. The page is parsed synchronously
+        inside the coroutine.
+        """
+        page_text = await self.get_async_client().get_text(
+            self.DSE_COMPANY_URL + symbol
         )
-        df_fin_perf_all = pd.concat([df_fin_perf_all, df_fin_perf])
-        print(f"Download completed for {symbol}!")
-        return df_company_all, df_fin_perf_all
+        return self.parse_company_page(page_text, symbol)
+
+    async def afetch_company_bulk(self, symbols):
+        """
+        Async `get_company_data_bulk()`. All company pages are requested
+        concurrently on one event loop, capped by the async client, and
+        parsed synchronously one at a time as they arrive.
+        """
+        symbols = list(symbols)
+        results = await asyncio.gather(*[
+            self.afetch_company(symbol) for symbol in symbols
+        ], return_exceptions=True)
+        frames, errors = {}, {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                self.metrics.record_failure(symbol, result)
+                errors[symbol] = str(result)
+            else:
+                frames[symbol] = result
+        return self.concat_company_frames(symbols, frames, errors)
 
-    def save_company_data(self, symbol, path=''):
+    async def aclose(self):
+        if self.async_client is not None:
+            await self.async_client.aclose()
+        self.reset_async_client()
+
+    def save_company_data(self, symbol, path='', format='excel'):
+        storage = get_storage(format)
         company_df, fin_df = self.get_company_df(symbol)
-        company_df.to_excel(os.path.join(path, f'{symbol}_company_data.xlsx'), index=False)
-        fin_df.to_excel(os.path.join(path, f'{symbol}_financial_data.xlsx'), index=False)
+        with self.metrics.stage('write'):
+            storage.write(
+                company_df,
+                os.path.join(path, f'{symbol}_company_data{storage.extension}')
+            )
+            storage.write(
+                fin_df,
+                os.path.join(path, f'{symbol}_financial_data{storage.extension}')
+            )
+
+    def save_company_data_bulk(
+        self,
+        symbols,
+        path='',
+        format='excel',
+        max_workers=8,
+        rate_limit=2
+    ):
+        storage = get_storage(format)
+        company_df, fin_df, errors = self.get_company_data_bulk(
+            symbols, max_workers=max_workers, rate_limit=rate_limit
+        )
+        with self.metrics.stage('write'):
+            storage.write(
+                company_df,
+                os.path.join(path, f'company_data{storage.extension}')
+            )
+            storage.write(
+                fin_df,
+                os.path.join(path, f'financial_data{storage.extension}')
+            )
+        return errors
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+
+class BS4Backend(object):
+    """
+    Table lookups on a BeautifulSoup tree. This is the default backend.
+    """
+    name = 'bs4'
+
+    def load(self, text):
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(text, 'html.parser')
+
+    def find(self, doc, tag, attrs):
+        return doc.find(tag, attrs=attrs)
+
+    def find_all(self, doc, tag, attrs):
+        return doc.find_all(tag, attrs=attrs)
+
+    @staticmethod
+    def get_text(element):
+        return element.get_text()
+
+    def table_rows(self, table, tbody=False):
+        if tbody:
+            table = table.find("tbody")
+        rows = []
+        for row in table.find_all("tr"):
+            rows.append((
+                [th.get_text() for th in row.find_all("th")],
+                [td.get_text() for td in row.find_all("td")],
+            ))
+        return rows
+
+
+class LxmlBackend(object):
+    """
+    Table lookups on an lxml tree.
+
+    Gives the same rows and texts as BS4Backend but parses the page in C
+    and selects the tables with XPath, which is several times faster
+    on the large DSE archive pages.
+    """
+    name = 'lxml'
+
+    def __init__(self):
+        try:
+            import lxml.html
+        except ImportError:
+            raise ImportError(
+                "The lxml backend needs lxml. Install it with- "
+                "pip install stocksurferbd[lxml]"
+            )
+        self.lxml_html = lxml.html
+
+    def load(self, text):
+        return self.lxml_html.document_fromstring(text)
+
+    @staticmethod
+    def get_xpath(tag, attrs):
+        conditions = []
+        for key, value in attrs.items():
+            if key == 'class':
+                conditions.append(f'normalize-space(@class)="{value}"')
+            else:
+                conditions.append(f'@{key}="{value}"')
+        return f'.//{tag}' + ''.join(f'[{c}]' for c in conditions)
+
+    def find(self, doc, tag, attrs):
+        elements = doc.xpath(self.get_xpath(tag, attrs))
+        return elements[0] if elements else None
+
+    def find_all(self, doc, tag, attrs):
+        return doc.xpath(self.get_xpath(tag, attrs))
+
+    @staticmethod
+    def get_text(element):
+        return element.text_content()
+
+    def table_rows(self, table, tbody=False):
+        if tbody:
+            table = table.find(".//tbody")
+        rows = []
+        for row in table.iter("tr"):
+            rows.append((
+                [th.text_content() for th in row.iter("th")],
+                [td.text_content() for td in row.iter("td")],
+            ))
+        return rows
+
+
+HTML_BACKENDS = {
+    'bs4': BS4Backend,
+    'lxml': LxmlBackend,
+}
+
+
+def get_html_backend(backend='bs4'):
+    if not isinstance(backend, str):
+        return backend
+    if backend not in HTML_BACKENDS:
+        raise ValueError(
+            'Invalid HTML backend! Possible values are- '
+            + ', '.join(HTML_BACKENDS)
+        )
+    return HTML_BACKENDS[backend]()
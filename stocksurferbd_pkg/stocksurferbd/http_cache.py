@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+
+class CacheMissError(IOError):
+    pass
+
+
+class ResponseCache(object):
+    """
+    On-disk cache of page texts keyed by URL.
+
+    Every URL gets a TTL from the first `ttls` key found in it, the keys
+    given by the user are checked before DEFAULT_TTLS. Expired entries
+    are revalidated with ETag/Last-Modified when the server sent them.
+    The least recently used entries are removed once the cache grows
+    beyond `max_size` bytes. With `offline=True` only cached pages are
+    served, whatever their age, and a missing page raises
+    CacheMissError.
+
+    DSE history URLs carry the day they were made in `endDate`. Offline,
+    a URL that isn't cached is served the page last cached for the same
+    URL with another `endDate`.
+    """
+    DEFAULT_TTLS = {
+        'displayCompany.php': 24 * 3600,
+        'day_end_archive.php': 6 * 3600,
+        'company_graph_6m': 6 * 3600,
+        'latest_share_price': 60,
+        'current_price': 60,
+        'cbul.php': 3600,
+    }
+    REPLAY_PARAM = re.compile(r'(?<=[?&])endDate=[^&]*')
+
+    def __init__(
+        self,
+        cache_dir='.stocksurferbd_cache',
+        ttls=None,
+        default_ttl=3600,
+        max_size=512 * 1024 * 1024,
+        offline=False,
+    ):
+        self.cache_dir = cache_dir
+        # the user keys come first, get_ttl() returns the first match
+        self.ttls = dict(ttls or {})
+        for pattern, ttl in self.DEFAULT_TTLS.items():
+            self.ttls.setdefault(pattern, ttl)
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.offline = offline
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_path(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def get_ttl(self, url):
+        for pattern, ttl in self.ttls.items():
+            if pattern in url:
+                return ttl
+        return self.default_ttl
+
+    def get_replay_url(self, url):
+        return self.REPLAY_PARAM.sub('endDate=', url)
+
+    def load(self, url):
+        entry = self.read_entry(url)
+        if entry is None and self.offline:
+            alias = self.read_entry(self.get_replay_url(url))
+            if alias is not None and alias.get('alias_of'):
+                entry = self.read_entry(alias['alias_of'])
+        return entry
+
+    def read_entry(self, url):
+        path = self.get_path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        # the file mtime marks the last use for LRU eviction
+        os.utime(path)
+        return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry['fetched_at'] < self.get_ttl(entry['url'])
+
+    @staticmethod
+    def get_validators(entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def write_entry(self, entry):
+        path = self.get_path(entry['url'])
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(entry, cache_file)
+        os.replace(tmp_path, path)
+
+    def store(self, url, text, headers=None):
+        headers = headers or {}
+        self.write_entry({
+            'url': url,
+            'text': text,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+        })
+        replay_url = self.get_replay_url(url)
+        if replay_url != url:
+            # points the URL without its endDate to this page for offline
+            # replay on later days
+            self.write_entry({
+                'url': replay_url,
+                'alias_of': url,
+                'fetched_at': time.time(),
+            })
+        self.evict()
+
+    def refresh(self, entry):
+        entry['fetched_at'] = time.time()
+        self.write_entry(entry)
+
+    def evict(self):
+        with self.lock:
+            files = []
+            total_size = 0
+            for item in os.scandir(self.cache_dir):
+                if not item.name.endswith('.json'):
+                    continue
+                stat = item.stat()
+                files.append((stat.st_mtime, stat.st_size, item.path))
+                total_size += stat.st_size
+            if total_size <= self.max_size:
+                return
+            for _, size, path in sorted(files):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total_size -= size
+                if total_size <= self.max_size:
+                    break
+
+    def clear(self):
+        with self.lock:
+            for item in os.scandir(self.cache_dir):
+                if item.name.endswith('.json'):
+                    os.remove(item.path)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import asyncio
+import threading
+import time
+import urllib.parse as parse_url
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .http_cache import CacheMissError
+from .metrics import MetricsCollector
+
+
+class RateLimiter(object):
+    """Spaces out calls so that at most `rate` of them start per second."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_time = 0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait_time = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class HttpClient(object):
+    """
+    Shared HTTP transport for PriceData and FundamentalData.
+
+    Keeps connections alive in a pooled session, applies a timeout to
+    every request, retries connection errors and 5xx responses with
+    exponential backoff and caps the number of in-flight requests per host.
+    Page texts are served from `cache` (a ResponseCache) when one is given.
+    Request times, bytes, retries and cache hits are recorded in `metrics`.
+    """
+
+    RETRY_STATUS = (500, 502, 503, 504)
+
+    def __init__(
+        self,
+        timeout=(10, 60),
+        retries=3,
+        backoff_factor=0.5,
+        pool_size=16,
+        max_per_host=8,
+        cache=None,
+        metrics=None,
+    ):
+        self.timeout = timeout
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else MetricsCollector()
+        self.max_per_host = max_per_host
+        self.host_locks = {}
+        self.lock = threading.Lock()
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUS,
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get_host_lock(self, url):
+        host = parse_url.urlsplit(url).netloc
+        with self.lock:
+            if host not in self.host_locks:
+                self.host_locks[host] = threading.BoundedSemaphore(
+                    self.max_per_host
+                )
+            return self.host_locks[host]
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        with self.get_host_lock(url), self.metrics.stage('http'):
+            resp = self.session.get(url, **kwargs)
+        self.metrics.add('http_requests')
+        self.metrics.add('http_bytes', len(resp.content))
+        retries = getattr(resp.raw, 'retries', None)
+        if retries is not None and retries.history:
+            self.metrics.add('http_retries', len(retries.history))
+        if not resp.ok:
+            self.metrics.add('http_errors')
+        resp.raise_for_status()
+        return resp
+
+    def get_text(self, url, **kwargs):
+        if self.cache is None:
+            return self.get(url, **kwargs).text
+
+        entry = self.cache.load(url)
+        if entry is not None and (self.cache.offline or self.cache.is_fresh(entry)):
+            self.metrics.add('cache_hits')
+            return entry['text']
+        if self.cache.offline:
+            raise CacheMissError(f"No cached response for: {url}")
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            headers.update(self.cache.get_validators(entry))
+        resp = self.get(url, headers=headers, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            self.metrics.add('cache_revalidated')
+            self.cache.refresh(entry)
+            return entry['text']
+        self.cache.store(url, resp.text, resp.headers)
+        return resp.text
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncHttpClient(object):
+    """
+    asyncio counterpart of HttpClient built on httpx.AsyncClient, for the
+    `afetch_*` methods of PriceData and FundamentalData.
+
+    At most `max_in_flight` requests run at once, and `max_per_host` per
+    host. Connection errors and 5xx responses are retried with
+    exponential backoff. Uses the same `cache` and `metrics` as
+    HttpClient. Needs httpx- `pip install stocksurferbd[async]`
+
+    The client is bound to the event loop of its first request. When that
+    loop has ended, the next request drops the old session and opens a new
+    one on the running loop. Await `aclose()` to close the connections.
+    """
+
+    RETRY_STATUS = HttpClient.RETRY_STATUS
+
+    def __init__(
+        self,
+        timeout=(10, 60),
+        retries=3,
+        backoff_factor=0.5,
+        max_in_flight=64,
+        max_per_host=8,
+        cache=None,
+        metrics=None,
+    ):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "The async methods need httpx. Install it with- "
+                "pip install stocksurferbd[async]"
+            )
+        self.httpx = httpx
+        connect_timeout, read_timeout = (
+            timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_in_flight = max_in_flight
+        self.max_per_host = max_per_host
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else MetricsCollector()
+        self.loop = None
+        self.session = None
+        self.semaphores = {}
+
+    def get_session(self):
+        # the session and semaphores belong to one event loop. The session
+        # of an ended loop can't be closed any more and is dropped. One of
+        # a loop still running can't be closed from another loop, its
+        # connections would be left open, so the client refuses it
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            if self.session is not None and not self.loop.is_closed():
+                raise RuntimeError(
+                    "The AsyncHttpClient is open on another event loop, "
+                    "await aclose() before using it on a new loop"
+                )
+            self.loop = loop
+            self.semaphores = {}
+            self.session = self.httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.httpx.Limits(max_connections=self.max_in_flight),
+                follow_redirects=True,
+            )
+        return self.session
+
+    def get_semaphore(self, host=None):
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.BoundedSemaphore(
+                self.max_in_flight if host is None else self.max_per_host
+            )
+        return self.semaphores[host]
+
+    async def get(self, url, headers=None):
+        session = self.get_session()
+        host = parse_url.urlsplit(url).netloc
+        async with self.get_semaphore(), self.get_semaphore(host):
+            with self.metrics.stage('http'):
+                for attempt in range(self.retries + 1):
+                    try:
+                        resp = await session.get(url, headers=headers)
+                    except self.httpx.TransportError:
+                        if attempt == self.retries:
+                            raise
+                    else:
+                        if (
+                            resp.status_code not in self.RETRY_STATUS
+                            or attempt == self.retries
+                        ):
+                            break
+                    self.metrics.add('http_retries')
+                    await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+        self.metrics.add('http_requests')
+        self.metrics.add('http_bytes', len(resp.content))
+        if resp.is_error:
+            self.metrics.add('http_errors')
+            # httpx also raises for 304, which the cache handles
+            resp.raise_for_status()
+        return resp
+
+    async def get_text(self, url, headers=None):
+        if self.cache is None:
+            return (await self.get(url, headers=headers)).text
+
+        entry = self.cache.load(url)
+        if entry is not None and (self.cache.offline or self.cache.is_fresh(entry)):
+            self.metrics.add('cache_hits')
+            return entry['text']
+        if self.cache.offline:
+            raise CacheMissError(f"No cached response for: {url}")
+
+        headers = dict(headers or {})
+        if entry is not None:
+            headers.update(self.cache.get_validators(entry))
+        resp = await self.get(url, headers=headers)
+        if resp.status_code == 304 and entry is not None:
+            self.metrics.add('cache_revalidated')
+            self.cache.refresh(entry)
+            return entry['text']
+        self.cache.store(url, resp.text, resp.headers)
+        return resp.text
+
+    async def aclose(self):
+        if self.session is not None:
+            # the connections of an ended loop went with it
+            if not self.loop.is_closed():
+                await self.session.aclose()
+            self.session = None
+            self.loop = None
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+def bollinger_bands(close, period, std_mult=2.0):
+    """
+    Upper, middle and lower Bollinger bands from one rolling mean and
+    one rolling (population) standard deviation.
+    """
+    rolling = close.rolling(period)
+    middle = rolling.mean()
+    deviation = rolling.std(ddof=0) * std_mult
+    return middle + deviation, middle, middle - deviation
+
+
+def wilder_mean(values, period):
+    # Wilder's smoothing seeded with the simple mean of the first
+    # `period` values, i.e. avg = (avg * (period - 1) + value) / period
+    smoothed = pd.Series(np.nan, index=values.index)
+    if len(values) <= period:
+        return smoothed
+    seeded = values.iloc[period:].copy()
+    seeded.iloc[0] = values.iloc[1:period + 1].mean()
+    smoothed.iloc[period:] = seeded.ewm(
+        alpha=1.0 / period, adjust=False
+    ).mean().values
+    return smoothed
+
+
+def rsi(close, period):
+    """
+    Wilder's relative strength index. The first value is at position
+    `period` of `close`, the earlier ones are NaN.
+    """
+    change = close.diff()
+    avg_gain = wilder_mean(change.clip(lower=0), period)
+    avg_loss = wilder_mean((-change).clip(lower=0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi_values = 100 - 100 / (1 + avg_gain / avg_loss)
+    return rsi_values.mask(avg_loss == 0, 100.0)
+
+
+def macd(close, fast, slow, smooth):
+    """
+    MACD line, signal line and histogram. Both EMAs need `slow` values
+    before they start.
+    """
+    fast_ema = close.ewm(span=fast, min_periods=slow).mean()
+    slow_ema = close.ewm(span=slow, min_periods=slow).mean()
+    macd_line = pd.Series(fast_ema - slow_ema, name='macd')
+    macd_sig = pd.Series(
+        macd_line.ewm(span=smooth, min_periods=smooth).mean(),
+        name='macd_sig'
+    )
+    macd_hist = pd.Series(macd_line - macd_sig, name='macd_hist')
+    return macd_line, macd_sig, macd_hist
+
+
+def fractals(high, low):
+    """
+    Williams fractals. A bar is a high (low) fractal when its high (low)
+    is above (below) the two bars on each side of it.
+    """
+    fractal_high = (
+        (high > high.shift(1)) & (high > high.shift(2))
+        & (high > high.shift(-1)) & (high > high.shift(-2))
+    )
+    fractal_low = (
+        (low < low.shift(1)) & (low < low.shift(2))
+        & (low < low.shift(-1)) & (low < low.shift(-2))
+    )
+    return fractal_high, fractal_low
+
+
+class StreamingEMA(object):
+    """
+    Exponential moving average updated one value at a time. Gives the
+    same values as `Series.ewm(span=span, min_periods=min_periods).mean()`.
+    """
+
+    def __init__(self, span, min_periods=0):
+        self.decay = 1 - 2.0 / (span + 1)
+        self.min_periods = min_periods
+        self.weighted_sum = 0.0
+        self.weight = 0.0
+        self.count = 0
+        self.value = np.nan
+
+    def update(self, value):
+        self.weighted_sum = value + self.decay * self.weighted_sum
+        self.weight = 1 + self.decay * self.weight
+        self.count += 1
+        if self.count >= self.min_periods:
+            self.value = self.weighted_sum / self.weight
+        return self.value
+
+    def seed(self, values):
+        for value in values:
+            self.update(value)
+        return self
+
+
+class StreamingMACD(object):
+    """
+    MACD line, signal line and histogram updated one close at a time,
+    matching `macd()`.
+    """
+
+    def __init__(self, fast, slow, smooth):
+        self.fast_ema = StreamingEMA(fast, min_periods=slow)
+        self.slow_ema = StreamingEMA(slow, min_periods=slow)
+        self.signal_ema = StreamingEMA(smooth, min_periods=smooth)
+        self.value = (np.nan, np.nan, np.nan)
+
+    def update(self, close):
+        macd_line = self.fast_ema.update(close) - self.slow_ema.update(close)
+        if np.isnan(macd_line):
+            return self.value
+        macd_sig = self.signal_ema.update(macd_line)
+        self.value = (macd_line, macd_sig, macd_line - macd_sig)
+        return self.value
+
+    def seed(self, closes):
+        for close in closes:
+            self.update(close)
+        return self
+
+
+class StreamingRSI(object):
+    """
+    Wilder's RSI updated one close at a time, matching `rsi()`.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.prev_close = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value = np.nan
+
+    def update(self, close):
+        if self.prev_close is None:
+            self.prev_close = close
+            return self.value
+        change = close - self.prev_close
+        self.prev_close = close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        self.count += 1
+        if self.count <= self.period:
+            # the first average is the simple mean of `period` changes
+            self.avg_gain += gain / self.period
+            self.avg_loss += loss / self.period
+            if self.count < self.period:
+                return self.value
+        else:
+            self.avg_gain += (gain - self.avg_gain) / self.period
+            self.avg_loss += (loss - self.avg_loss) / self.period
+        if self.avg_loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+        return self.value
+
+    def seed(self, closes):
+        for close in closes:
+            self.update(close)
+        return self
+
+
+class StreamingBollinger(object):
+    """
+    Upper, middle and lower Bollinger bands updated one close at a time
+    from a running mean and sum of squared deviations of the window
+    (Welford), matching `bollinger_bands()`.
+    """
+
+    def __init__(self, period, std_mult=2.0):
+        self.period = period
+        self.std_mult = std_mult
+        self.window = deque()
+        self.mean = 0.0
+        self.sq_dev = 0.0
+        self.same_count = 0
+        self.updates = 0
+        self.value = (np.nan, np.nan, np.nan)
+
+    def update(self, close):
+        if self.window and close == self.window[-1]:
+            self.same_count += 1
+        else:
+            self.same_count = 1
+        self.window.append(close)
+        self.updates += 1
+        if len(self.window) > self.period:
+            old = self.window.popleft()
+            delta = close - old
+            mean = self.mean + delta / self.period
+            self.sq_dev += delta * (close - mean + old - self.mean)
+            self.mean = mean
+        else:
+            delta = close - self.mean
+            self.mean += delta / len(self.window)
+            self.sq_dev += delta * (close - self.mean)
+        if self.updates % self.period == 0:
+            # resum the window now and then so rounding errors don't pile up
+            self.mean = sum(self.window) / len(self.window)
+            self.sq_dev = sum((v - self.mean) ** 2 for v in self.window)
+        if len(self.window) < self.period:
+            return self.value
+        if self.same_count >= self.period:
+            # a flat window has no spread, like pandas' rolling std
+            variance = 0.0
+        else:
+            variance = max(self.sq_dev / self.period, 0.0)
+        deviation = np.sqrt(variance) * self.std_mult
+        self.value = (self.mean + deviation, self.mean, self.mean - deviation)
+        return self.value
+
+    def seed(self, closes):
+        for close in list(closes)[-self.period:]:
+            self.update(close)
+        return self
+
+
+class StreamingFractals(object):
+    """
+    Williams fractals updated one bar at a time. A fractal needs two
+    later bars, so `update` returns (fractal_high, fractal_low) of the
+    bar two bars before the new one.
+    """
+
+    def __init__(self):
+        self.highs = deque(maxlen=5)
+        self.lows = deque(maxlen=5)
+        self.value = (False, False)
+
+    def update(self, high, low):
+        self.highs.append(high)
+        self.lows.append(low)
+        if len(self.highs) < 5:
+            return self.value
+        mid_high, mid_low = self.highs[2], self.lows[2]
+        self.value = (
+            all(mid_high > h for i, h in enumerate(self.highs) if i != 2),
+            all(mid_low < v for i, v in enumerate(self.lows) if i != 2),
+        )
+        return self.value
+
+    def seed(self, highs, lows):
+        for high, low in list(zip(highs, lows))[-5:]:
+            self.update(high, low)
+        return self
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import importlib
+
+
+class LazyModule(object):
+    """
+    Stands in for a module and imports it on first attribute access, so
+    heavy libraries are only loaded when they are used.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+
+    def __getattr__(self, attr):
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return getattr(self.module, attr)
+
+
+def lazy_getattr(package_name, exports):
+    """
+    Module level `__getattr__` for a package that imports each of its
+    `exports` (name -> module) on first access.
+    """
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(
+                f"module {package_name!r} has no attribute {name!r}"
+            )
+        module = importlib.import_module(exports[name], package_name)
+        value = getattr(module, name)
+        setattr(importlib.import_module(package_name), name, value)
+        return value
+    return __getattr__
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+class MetricsCollector(object):
+    """
+    Collects the time spent in every stage of a download job (`http`,
+    `parse`, `convert`, `write`), counters like `http_bytes` and
+    `http_retries`, and the symbols that failed.
+
+    Pass the same collector to HttpClient, PriceData and FundamentalData
+    to get one summary for the whole job. The summary can be exported as
+    JSON or as Prometheus text.
+    """
+    PREFIX = 'stocksurferbd'
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+            self.counters = {}
+            self.failures = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        with self.lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = {
+                    'count': 0, 'total': 0.0, 'min': seconds, 'max': seconds,
+                }
+            stage['count'] += 1
+            stage['total'] += seconds
+            stage['min'] = min(stage['min'], seconds)
+            stage['max'] = max(stage['max'], seconds)
+
+    def add(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_failure(self, symbol, error):
+        with self.lock:
+            self.failures.append({
+                'symbol': symbol,
+                'error': str(error),
+                'time': time.time(),
+            })
+
+    def summary(self):
+        with self.lock:
+            return {
+                'stages': {
+                    name: dict(
+                        stage,
+                        mean=stage['total'] / stage['count'],
+                    )
+                    for name, stage in self.stages.items()
+                },
+                'counters': dict(self.counters),
+                'failures': list(self.failures),
+            }
+
+    def to_json(self, path=None):
+        text = json.dumps(self.summary(), indent=2)
+        if path is not None:
+            with open(path, 'w') as json_file:
+                json_file.write(text)
+        return text
+
+    def to_prometheus(self):
+        summary = self.summary()
+        prefix = self.PREFIX
+        lines = [
+            f'# HELP {prefix}_stage_seconds Time spent in each stage.',
+            f'# TYPE {prefix}_stage_seconds summary',
+        ]
+        for name, stage in sorted(summary['stages'].items()):
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {stage["total"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {stage["count"]}')
+        for name, value in sorted(summary['counters'].items()):
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        lines.append(f'# TYPE {prefix}_failures_total counter')
+        lines.append(f'{prefix}_failures_total {len(summary["failures"])}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .price_bars import PriceBars
+from .storage import (
+    OHLCV_DTYPE,
+    OhlcvStorage,
+    append_ohlcv,
+    get_storage,
+    infer_format,
+    open_ohlcv,
+    to_ohlcv_records,
+    to_typed_price_frame,
+    write_ohlcv,
+)
+
+
+class PriceArchive(object):
+    """
+    Price history in one fixed-width binary file per symbol, opened with
+    numpy.memmap- `<root_path>/market=DSE/ACI.ohlcv`.
+
+    A file is a short header with the symbol followed by its rows sorted
+    by DATE, 80 bytes each (OHLCV_DTYPE). The rows of a date range are
+    found by binary search on the DATE column and returned as views of
+    the mapped file, so reading a window of any symbol copies nothing.
+    Rows after the last stored date are appended to the file, other rows
+    are merged into it.
+
+    Windows, bars and frames read from the archive keep the file mapped.
+    Drop them before writing rows of the same symbol, Windows can't
+    resize or replace a mapped file.
+    """
+    MARKETS = ('DSE', 'CSE')
+
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self.lock = threading.Lock()
+
+    def check_market(self, market):
+        if market not in self.MARKETS:
+            raise IOError('Invalid Stock Market! Possible values are- CSE, DSE')
+
+    def get_market_path(self, market):
+        return os.path.join(self.root_path, f'market={market}')
+
+    def get_path(self, symbol, market='DSE'):
+        return os.path.join(
+            self.get_market_path(market), symbol + OhlcvStorage.extension
+        )
+
+    def get_symbols(self, market='DSE'):
+        self.check_market(market)
+        market_path = self.get_market_path(market)
+        if not os.path.isdir(market_path):
+            return []
+        return sorted(
+            name[:-len(OhlcvStorage.extension)]
+            for name in os.listdir(market_path)
+            if name.endswith(OhlcvStorage.extension)
+        )
+
+    def get_records(self, symbol, market='DSE'):
+        """All rows of a symbol as a read-only memmap, empty when not stored."""
+        self.check_market(market)
+        path = self.get_path(symbol, market)
+        if not os.path.exists(path):
+            return np.zeros(0, dtype=OHLCV_DTYPE)
+        return open_ohlcv(path)[1]
+
+    def get_window(
+        self,
+        symbol,
+        start_date=None,
+        end_date=None,
+        n=None,
+        market='DSE'
+    ):
+        """
+        Rows of a symbol between `start_date` and `end_date` inclusive,
+        only the last `n` of them when `n` is given. The rows are a view
+        of the mapped file.
+        """
+        records = self.get_records(symbol, market=market)
+        dates = records['DATE']
+        start, end = 0, len(records)
+        if start_date is not None:
+            start = np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date), 'ns'), 'left')
+        if end_date is not None:
+            end = np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date), 'ns'), 'right')
+        if n is not None:
+            start = max(start, end - n)
+        return records[start:end]
+
+    def read_bars(
+        self,
+        symbol,
+        start_date=None,
+        end_date=None,
+        n=None,
+        market='DSE'
+    ):
+        records = self.get_window(
+            symbol, start_date=start_date, end_date=end_date, n=n, market=market
+        )
+        return PriceBars(
+            records['DATE'],
+            np.zeros(len(records), dtype='int8'),
+            np.array([symbol], dtype=object),
+            {name: records[name] for name in OHLCV_DTYPE.names[1:]},
+        )
+
+    def read_symbol(
+        self,
+        symbol,
+        start_date=None,
+        end_date=None,
+        n=None,
+        market='DSE'
+    ):
+        """Rows of `get_window()` as a DataFrame with a TRADING_CODE column."""
+        return self.read_bars(
+            symbol, start_date=start_date, end_date=end_date, n=n, market=market
+        ).to_frame()
+
+    def write(self, df, market='DSE'):
+        """
+        Insert or update price rows, given as a DataFrame, row dicts or
+        PriceBars. Rows with an existing (TRADING_CODE, DATE) replace
+        the stored row. Returns the number of rows written.
+        """
+        self.check_market(market)
+        if isinstance(df, PriceBars):
+            df = df.to_frame()
+        df = pd.DataFrame(df)
+        if 'TRADING_CODE' in (df.index.names or []):
+            df = df.reset_index()
+        df = to_typed_price_frame(df.reset_index(drop=True))
+        if df.empty:
+            return 0
+        os.makedirs(self.get_market_path(market), exist_ok=True)
+        with self.lock:
+            for symbol, df_symbol in df.groupby('TRADING_CODE', sort=False):
+                df_symbol = df_symbol.drop_duplicates(subset=['DATE'], keep='last')
+                self.write_symbol(symbol, to_ohlcv_records(df_symbol), market)
+        return len(df)
+
+    def write_symbol(self, symbol, records, market='DSE'):
+        path = self.get_path(symbol, market)
+        stored = self.get_records(symbol, market=market)
+        n_rows = len(stored)
+        # the map of the file is released before it is written
+        if n_rows and records['DATE'][0] > stored['DATE'][-1]:
+            # the daily update only adds rows at the end of the file
+            del stored
+            append_ohlcv(path, records, n_rows)
+            return
+        if n_rows:
+            records = np.concatenate([stored, records])
+            records = records[np.argsort(records['DATE'], kind='stable')]
+            # keep the last row of every date, the new one
+            is_last = np.append(records['DATE'][1:] != records['DATE'][:-1], True)
+            records = records[is_last]
+        del stored
+        write_ohlcv(path, symbol, records)
+
+    def import_history_data(self, full_path, market='DSE', format=None):
+        storage = get_storage(format or infer_format(full_path), history=True)
+        return self.write(storage.read(full_path), market=market)
+
+    def import_store(self, store, market='DSE', symbols=None):
+        """Convert the rows of a PriceStore to the archive."""
+        return self.write(store.read(market=market, symbols=symbols), market=market)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import numpy as np
+import pandas as pd
+
+from .storage import PRICE_INT_COLUMNS, to_typed_price_frame
+
+
+class PriceBars(object):
+    """
+    Price rows kept as one NumPy array per column.
+
+    DATE is a datetime64 array, TRADING_CODE is stored once per symbol in
+    `symbols` with a small integer code per row, prices are float64 and
+    TRADE/VOLUME are int64. A row takes about 100 bytes instead of the
+    ~1 KB of a row dict. Columns a source doesn't have (e.g. LTP of CSE
+    history) are left out instead of being filled with zeros.
+
+    `to_frame()` wraps the arrays in a DataFrame without copying them, so
+    changing the frame in place changes the bars too.
+    """
+    __slots__ = ('dates', 'codes', 'symbols', 'columns')
+
+    def __init__(self, dates, codes, symbols, columns):
+        self.dates = dates
+        self.codes = codes
+        self.symbols = symbols
+        self.columns = columns
+
+    @classmethod
+    def from_frame(cls, df):
+        if 'TRADING_CODE' in (df.index.names or []):
+            df = df.reset_index()
+        df = to_typed_price_frame(df)
+        symbols = pd.Categorical(df['TRADING_CODE'])
+        columns = {
+            col: df[col].to_numpy(
+                dtype='int64' if col in PRICE_INT_COLUMNS else 'float64'
+            )
+            for col in df.columns if col not in ('DATE', 'TRADING_CODE')
+        }
+        return cls(
+            df['DATE'].to_numpy(dtype='datetime64[ns]'),
+            symbols.codes,
+            symbols.categories.to_numpy(dtype=object),
+            columns,
+        )
+
+    @classmethod
+    def concat(cls, bars_list):
+        """
+        Join bars of different symbols or dates. The symbol codes are
+        mapped to the symbols of all the bars and a column missing in
+        some of them is filled with NaN (prices) or 0 (TRADE/VOLUME).
+        """
+        bars_list = [bars for bars in bars_list if len(bars)]
+        if not bars_list:
+            return cls.from_frame(pd.DataFrame({'DATE': [], 'TRADING_CODE': []}))
+        symbols = pd.Index(np.concatenate([bars.symbols for bars in bars_list])).unique()
+        codes = pd.Categorical.from_codes(np.concatenate([
+            symbols.get_indexer(bars.symbols)[bars.codes] for bars in bars_list
+        ]), symbols).codes
+        names = []
+        for bars in bars_list:
+            names.extend(col for col in bars.columns if col not in names)
+        columns = {}
+        for col in names:
+            dtype = 'int64' if col in PRICE_INT_COLUMNS else 'float64'
+            columns[col] = np.concatenate([
+                bars.columns[col] if col in bars.columns
+                else np.full(len(bars), 0 if dtype == 'int64' else np.nan, dtype=dtype)
+                for bars in bars_list
+            ])
+        return cls(
+            np.concatenate([bars.dates for bars in bars_list]),
+            codes,
+            symbols.to_numpy(dtype=object),
+            columns,
+        )
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, col):
+        if col == 'DATE':
+            return self.dates
+        if col == 'TRADING_CODE':
+            return self.symbols[self.codes]
+        return self.columns[col]
+
+    def __repr__(self):
+        return (
+            f'<PriceBars: {len(self)} rows, {len(self.symbols)} symbols, '
+            f'columns {list(self.columns)}>'
+        )
+
+    @property
+    def nbytes(self):
+        return (
+            self.dates.nbytes
+            + self.codes.nbytes
+            + sum(len(symbol) for symbol in self.symbols)
+            + sum(values.nbytes for values in self.columns.values())
+        )
+
+    def take(self, rows):
+        """Bars of the rows selected by a boolean mask or positions."""
+        return PriceBars(
+            self.dates[rows],
+            self.codes[rows],
+            self.symbols,
+            {col: values[rows] for col, values in self.columns.items()},
+        )
+
+    def symbol(self, symbol):
+        positions = np.flatnonzero(self.symbols == symbol)
+        if not len(positions):
+            return self.take(np.zeros(len(self), dtype=bool))
+        return self.take(self.codes == positions[0])
+
+    def to_frame(self):
+        """
+        DataFrame of the bars, TRADING_CODE as a categorical column. The
+        arrays are shared with the frame, not copied.
+        """
+        data = {
+            'DATE': self.dates,
+            'TRADING_CODE': pd.Categorical.from_codes(self.codes, self.symbols),
+        }
+        data.update(self.columns)
+        return pd.DataFrame(data, copy=False)
@@ -3,16 +3,34 @@
 __author__ = "Sk Farhad"
 __copyright__ = "Copyright (c) 2021 The Python Packaging Authority"
 
+import asyncio
 import os
 import csv
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from bs4 import BeautifulSoup
+import numpy as np
 import pandas as pd
-import requests
 import datetime
 from dateutil import parser
 import urllib.parse as parse_url
 
+from .http_client import AsyncHttpClient, HttpClient, RateLimiter
+from .html_backends import get_html_backend
+from .metrics import MetricsCollector
+from .price_bars import PriceBars
+from .storage import get_storage, infer_format, to_typed_price_frame
+
+
+CSE_GRAPH_NUMBER = r'\s*(-?[\d.]+)\s*'
+CSE_GRAPH_RECORD = re.compile(
+    r'Date\(' + ','.join([r'\s*(\d+)\s*'] * 3) + r'\);\s*'
+    + r'ohlcData\.push\(\[\s*date\s*,' + ','.join([CSE_GRAPH_NUMBER] * 4) + r'\]\);\s*'
+    + r'volumeData\.push\(\[\s*date\s*,' + CSE_GRAPH_NUMBER + r'\]\);'
+)
+# zero columns of the CSE graph rows, left out of PriceBars
+CSE_GRAPH_PLACEHOLDERS = ['LTP', 'YCP', '% CHANGE', 'TRADE', 'VALUE_MN']
+
 
 class PriceData(object):
     HISTORY_URL_DSE = "https://www.dsebd.org/day_end_archive.php?endDate=<date>&archive=data"
@@ -20,6 +38,45 @@ class PriceData(object):
     CURRENT_PRICE_URL_DSE = 'https://www.dsebd.org/latest_share_price_scroll_l.php'
     CURRENT_PRICE_URL_CSE = 'https://www.cse.com.bd/market/current_price'
     CKT_BREAKER_URL_DSE = 'https://www.dsebd.org/cbul.php'
+    ALL_INSTRUMENTS_DSE = 'All Instrument'
+
+    def __init__(
+        self,
+        client=None,
+        html_backend='bs4',
+        cache=None,
+        metrics=None,
+        async_client=None,
+    ):
+        if metrics is None:
+            metrics = (
+                getattr(client, 'metrics', None)
+                or getattr(async_client, 'metrics', None)
+                or MetricsCollector()
+            )
+        self.metrics = metrics
+        self.client = client if client is not None else HttpClient(
+            cache=cache, metrics=metrics
+        )
+        self.async_client = async_client
+        self.own_async_client = False
+        self.html_backend = get_html_backend(html_backend)
+
+    def get_async_client(self):
+        # made on first use of an `afetch_*` method, httpx is optional
+        if self.async_client is None:
+            self.async_client = AsyncHttpClient(
+                cache=getattr(self.client, 'cache', None), metrics=self.metrics
+            )
+            self.own_async_client = True
+        return self.async_client
+
+    def reset_async_client(self):
+        # drops the async client made by get_async_client(), the next
+        # `afetch_*` call makes a new one
+        if self.own_async_client:
+            self.async_client = None
+            self.own_async_client = False
 
     @staticmethod
     def get_date():
@@ -39,6 +96,52 @@ class PriceData(object):
         ).replace('--', '0')
         return int(new_val)
 
+    @staticmethod
+    def parse_text_column(cells):
+        # whitespace is removed from every cell in one vectorized call
+        return pd.Series(cells, dtype=object).str.replace(
+            r'\s+', '', regex=True
+        ).values
+
+    @staticmethod
+    def parse_number_column(cells):
+        # the cells are cleaned like parse_float() by vectorized string
+        # calls and converted in one step, a cell that isn't a number
+        # becomes NaN
+        values = pd.Series(cells, dtype=object).str.replace(
+            r'\s+', '', regex=True
+        ).str.replace(',', '', regex=False).str.replace('--', '0', regex=False)
+        return pd.to_numeric(values, errors='coerce').astype('float64').values
+
+    @staticmethod
+    def parse_price_columns(rows, columns, text_columns=('DATE', 'TRADING_CODE')):
+        """
+        Typed price frame from the cell texts of table rows. `columns`
+        maps every column name to its cell position. The texts are
+        collected column by column and each column is converted in one
+        vectorized step. Rows with a number that can't be parsed are
+        dropped.
+        """
+        n_cells = max(columns.values()) + 1
+        rows = [row for row in rows if len(row) >= n_cells]
+        df = pd.DataFrame({
+            col: (
+                PriceData.parse_text_column if col in text_columns
+                else PriceData.parse_number_column
+            )([row[i] for row in rows])
+            for col, i in columns.items()
+        })
+        number_columns = [col for col in columns if col not in text_columns]
+        df = df.dropna(subset=number_columns).reset_index(drop=True)
+        return to_typed_price_frame(df)
+
+    @staticmethod
+    def to_output(df, output):
+        # the frame and bars outputs share the columnar parsing path
+        if output == 'bars':
+            return PriceBars.from_frame(df)
+        return df
+
     @staticmethod
     def save_csv(dict_list, csv_path):
         keys = dict_list[0].keys()
@@ -52,52 +155,103 @@ class PriceData(object):
         df = pd.DataFrame(dict_list)
         df.to_excel(csv_path)
 
-    def get_history_url(self):
-        cur_date = self.get_date()
-        return self.HISTORY_URL_DSE.replace('<date>', cur_date)
+    @staticmethod
+    def save_data(data, full_path, format='excel'):
+        storage = get_storage(format, history=True)
+        if isinstance(data, PriceBars):
+            data = data.to_frame()
+        df = pd.DataFrame(data)
+        if storage.columnar:
+            df = to_typed_price_frame(df)
+        storage.write(df, full_path, index=not storage.columnar)
 
-    def parse_price_history_dse(self, symbol):
-        full_url = self.get_history_url() + "&inst=" + parse_url.quote(symbol)
-        target_page = requests.get(full_url)
-        bs_data = BeautifulSoup(target_page.text, 'html.parser')
-        dict_list = []
-        stock_table = bs_data.find(
-            "table",
-            attrs={
-                "class": "table table-bordered background-white shares-table fixedHeader"
-            }
+    @staticmethod
+    def load_data(full_path, format=None):
+        storage = get_storage(format or infer_format(full_path), history=True)
+        return to_typed_price_frame(storage.read(full_path))
+
+    def get_history_url(self, start_date=None, end_date=None):
+        cur_date = str(end_date) if end_date else self.get_date()
+        history_url = self.HISTORY_URL_DSE.replace('<date>', cur_date)
+        if start_date:
+            history_url += "&startDate=" + str(start_date)
+        return history_url
+
+    def parse_price_history_dse(
+        self,
+        symbol,
+        start_date=None,
+        end_date=None,
+        output='list'
+    ):
+        page_text = self.client.get_text(
+            self.get_history_url_dse(symbol, start_date=start_date, end_date=end_date)
         )
-        table_rows = stock_table.find("tbody").find_all("tr")
-        for row in table_rows:
-            row_data = ["".join(td.get_text().split()) for td in row.find_all("td")]
-            try:
-                dict_list.append({
-                    'DATE': row_data[1],
-                    'TRADING_CODE': row_data[2],
-                    'LTP': self.parse_float(row_data[3]),
-                    'HIGH': self.parse_float(row_data[4]),
-                    'LOW': self.parse_float(row_data[5]),
-                    'OPENP': self.parse_float(row_data[6]),
-                    'CLOSEP': self.parse_float(row_data[7]),
-                    'YCP': self.parse_float(row_data[8]),
-                    'TRADE': self.parse_float(row_data[9].replace(',', '')),
-                    'VALUE_MN': self.parse_float(row_data[10]),
-                    'VOLUME': self.parse_float(row_data[11].replace(',', '')),
-                })
-            except Exception as e:
-                print(str(e))
-        return dict_list
+        return self.parse_history_page_dse(page_text, output=output)
 
-    def parse_current_prices_dse(self, soup, fp_dict=None):
+    def get_history_url_dse(self, symbol, start_date=None, end_date=None):
+        return self.get_history_url(
+            start_date=start_date, end_date=end_date
+        ) + "&inst=" + parse_url.quote(symbol)
+
+    def parse_history_page_dse(self, page_text, output='list'):
+        html = self.html_backend
+        with self.metrics.stage('parse'):
+            page_data = html.load(page_text)
+            stock_table = html.find(
+                page_data,
+                "table",
+                {
+                    "class": "table table-bordered background-white shares-table fixedHeader"
+                }
+            )
+            table_rows = html.table_rows(stock_table, tbody=True)
+        with self.metrics.stage('convert'):
+            dict_list = []
+            if output in ('frame', 'bars'):
+                return self.to_output(self.parse_price_columns(
+                    [td_texts for _, td_texts in table_rows],
+                    {
+                        'DATE': 1, 'TRADING_CODE': 2, 'LTP': 3, 'HIGH': 4,
+                        'LOW': 5, 'OPENP': 6, 'CLOSEP': 7, 'YCP': 8, 'TRADE': 9,
+                        'VALUE_MN': 10, 'VOLUME': 11,
+                    }
+                ), output)
+            for _, td_texts in table_rows:
+                row_data = ["".join(td.split()) for td in td_texts]
+                try:
+                    dict_list.append({
+                        'DATE': row_data[1],
+                        'TRADING_CODE': row_data[2],
+                        'LTP': self.parse_float(row_data[3]),
+                        'HIGH': self.parse_float(row_data[4]),
+                        'LOW': self.parse_float(row_data[5]),
+                        'OPENP': self.parse_float(row_data[6]),
+                        'CLOSEP': self.parse_float(row_data[7]),
+                        'YCP': self.parse_float(row_data[8]),
+                        'TRADE': self.parse_float(row_data[9].replace(',', '')),
+                        'VALUE_MN': self.parse_float(row_data[10]),
+                        'VOLUME': self.parse_float(row_data[11].replace(',', '')),
+                    })
+                except Exception as e:
+                    self.metrics.add('rows_skipped')
+                    self.metrics.record_failure(
+                        row_data[2] if len(row_data) > 2 else None, e
+                    )
+            return dict_list
+
+    def parse_current_prices_dse(self, soup, fp_dict=None, output='list'):
+        html = self.html_backend
         dict_list = []
-        table_header = soup.find(
+        table_header = html.find(
+            soup,
             'h2',
-            attrs={
+            {
                 'class': "BodyHead topBodyHead"
             }
         )
         # print(table_header)
-        date_txt = " ".join(table_header.text.split(
+        date_txt = " ".join(html.get_text(table_header).split(
             'On'
         )[1].split(
             'at'
@@ -105,17 +259,29 @@ class PriceData(object):
 
         ))
         latest_trading_date = parser.parse(date_txt).date()
-        stock_table = soup.find(
+        stock_table = html.find(
+            soup,
             "table",
-            attrs={
+            {
                 "class": "table table-bordered background-white shares-table fixedHeader"
             }
         )
-        table_rows = stock_table.find_all("tr")
+        table_rows = html.table_rows(stock_table)
+        if output in ('frame', 'bars'):
+            df = self.parse_price_columns(
+                [td_texts for th_texts, td_texts in table_rows if not th_texts],
+                {
+                    'TRADING_CODE': 1, 'LTP': 2, 'HIGH': 3, 'LOW': 4,
+                    'CLOSEP': 5, 'YCP': 6, '% CHANGE': 7, 'TRADE': 8,
+                    'VALUE_MN': 9, 'VOLUME': 10,
+                }
+            )
+            df.insert(0, 'DATE', np.datetime64(latest_trading_date, 'ns'))
+            return self.to_output(df, output)
         # print(type(table_rows))
-        for row in table_rows:
-            th_values = ["".join(th.get_text().split()) for th in row.find_all("th")]
-            td_values = ["".join(td.get_text().split()) for td in row.find_all("td")]
+        for th_texts, td_texts in table_rows:
+            th_values = ["".join(th.split()) for th in th_texts]
+            td_values = ["".join(td.split()) for td in td_texts]
             if len(th_values):
                 # print(th_values)
                 continue
@@ -137,18 +303,20 @@ class PriceData(object):
         return dict_list
 
     def parse_floor_prices_dse(self, soup):
+        html = self.html_backend
         fp_price_dict = {}
-        price_table = soup.find(
+        price_table = html.find(
+            soup,
             "table",
-            attrs={
+            {
                 "class": "table table-bordered background-white text-center"
             }
         )
-        table_rows = price_table.find_all("tr")
+        table_rows = html.table_rows(price_table)
         # print(type(table_rows))
-        for row in table_rows:
-            th_values = ["".join(th.get_text().split()) for th in row.find_all("th")]
-            td_values = ["".join(td.get_text().split()) for td in row.find_all("td")]
+        for th_texts, td_texts in table_rows:
+            th_values = ["".join(th.split()) for th in th_texts]
+            td_values = ["".join(td.split()) for td in td_texts]
             if len(th_values):
                 # print(th_values)
                 continue
@@ -160,22 +328,35 @@ class PriceData(object):
             })
         return fp_price_dict
 
-    def parse_current_prices_cse(self, soup):
+    def parse_current_prices_cse(self, soup, output='list'):
         dict_list = []
 
         date_txt = str(datetime.datetime.now().date())
         latest_trading_date = parser.parse(date_txt).date()
-        stock_table = soup.find(
+        html = self.html_backend
+        stock_table = html.find(
+            soup,
             "table",
-            attrs={
+            {
                 "id": "dataTable"
             }
         )
-        table_rows = stock_table.find_all("tr")
+        table_rows = html.table_rows(stock_table)
+        if output in ('frame', 'bars'):
+            df = self.parse_price_columns(
+                [td_texts for th_texts, td_texts in table_rows if not th_texts],
+                {
+                    'TRADING_CODE': 1, 'LTP': 2, 'OPEN': 3, 'HIGH': 4,
+                    'LOW': 5, 'YCP': 6, 'TRADE': 7, 'VALUE_MN': 8,
+                    'VOLUME': 9,
+                }
+            )
+            df.insert(0, 'DATE', np.datetime64(latest_trading_date, 'ns'))
+            return self.to_output(df, output)
         # print(type(table_rows))
-        for row in table_rows:
-            th_values = ["".join(th.get_text().split()) for th in row.find_all("th")]
-            td_values = ["".join(td.get_text().split()) for td in row.find_all("td")]
+        for th_texts, td_texts in table_rows:
+            th_values = ["".join(th.split()) for th in th_texts]
+            td_values = ["".join(td.split()) for td in td_texts]
             if len(th_values):
                 # print(th_values)
                 continue
@@ -193,89 +374,445 @@ class PriceData(object):
             })
         return dict_list
 
-    def parse_price_history_cse(self, symbol):
-        full_url = self.HISTORY_URL_CSE + symbol
-        resp = requests.get(
-            full_url
-        )
+    @staticmethod
+    def parse_cse_graph(resp_text, symbol, output='list'):
+        """
+        Price rows from the script of a CSE 6 month graph page, read in
+        one regex pass over the `date = new Date(..)`, `ohlcData.push(..)`
+        and `volumeData.push(..)` lines of every trading day. Returns a
+        list of row dicts, or a DataFrame built column by column with
+        `output='frame'`, or PriceBars without the zero placeholder
+        columns with `output='bars'`.
+        """
+        records = CSE_GRAPH_RECORD.findall(resp_text)
+        if output == 'frame':
+            return PriceData.cse_graph_frame(records, symbol)
+        if output == 'bars':
+            return PriceBars.from_frame(
+                PriceData.cse_graph_frame(records, symbol).drop(
+                    columns=CSE_GRAPH_PLACEHOLDERS
+                )
+            )
 
-        split1 = resp.text.split("volumeData.push([date, round(volume)]);")[1]
-        split2 = split1.split("$(document).ready(function () {")[0]
-
-        lines = split2.replace(
-            "date = new Date(", ""
-        ).replace(
-            "ohlcData.push([date, ", ""
-        ).replace(
-            "volumeData.push([date, ", ""
-        ).replace(
-            "]);", ""
-        ).replace(
-            ");", ""
-        ).replace(
-            "\n\n\n", "\n"
-        ).replace(
-            "\n\n", "\n"
-        ).replace(
-            " ", ""
-        ).lstrip().rstrip()
-
-        records = lines.split("\n\n")
         dict_list = []
-
-        for rec in records:
-            items = rec.split("\n")
-            date_comps = items[0].split(",")
-            new_month = str(int(date_comps[1]) + 1)
-            if len(new_month) < 2:
-                new_month = "0" + new_month
-            date_comps[1] = new_month
-            date = "-".join(date_comps)
-            volume = int(items[2])
-            high, low, open_p, close_p = (float(x) for x in items[1].split(','))
+        for year, month, day, high, low, open_p, close_p, volume in records:
+            # JavaScript months start from 0
             dict_list.append({
-                'DATE': date,
+                'DATE': f'{year}-{int(month) + 1:02d}-{day}',
                 'TRADING_CODE': symbol,
                 'LTP': 0,
-                'OPENP': open_p,
-                'HIGH': high,
-                'LOW': low,
-                'CLOSEP': close_p,
+                'OPENP': float(open_p),
+                'HIGH': float(high),
+                'LOW': float(low),
+                'CLOSEP': float(close_p),
                 'YCP': 0,
                 '% CHANGE': 0,
                 'TRADE': 0,
                 'VALUE_MN': 0,
-                'VOLUME': volume,
+                'VOLUME': int(float(volume)),
             })
-
         return dict_list
 
-    def save_history_data(self, symbol, file_path='', file_name='history_data.csv', market='DSE'):
+    @staticmethod
+    def cse_graph_frame(records, symbol):
+        records = np.array(records, dtype=str).reshape(-1, 8)
+        months = records[:, 1].astype(int) + 1
+        n_records = len(records)
+        zeros = np.zeros(n_records, dtype=np.int64)
+        return pd.DataFrame({
+            'DATE': [
+                f'{year}-{month:02d}-{day}'
+                for year, month, day in zip(records[:, 0], months, records[:, 2])
+            ],
+            'TRADING_CODE': [symbol] * n_records,
+            'LTP': zeros,
+            'OPENP': records[:, 5].astype(float),
+            'HIGH': records[:, 3].astype(float),
+            'LOW': records[:, 4].astype(float),
+            'CLOSEP': records[:, 6].astype(float),
+            'YCP': zeros,
+            '% CHANGE': zeros,
+            'TRADE': zeros,
+            'VALUE_MN': zeros,
+            'VOLUME': records[:, 7].astype(float).astype(np.int64),
+        })
+
+    def parse_price_history_cse(self, symbol, output='list'):
+        full_url = self.HISTORY_URL_CSE + symbol
+        resp_text = self.client.get_text(full_url)
+        with self.metrics.stage('parse'):
+            return self.parse_cse_graph(resp_text, symbol, output=output)
+
+    def save_history_data(
+        self,
+        symbol,
+        file_path='',
+        file_name='history_data.csv',
+        market='DSE',
+        format='excel'
+    ):
+        # typed files are built from a typed frame, excel/csv keep the
+        # cell values of the row parsers
+        output = 'frame' if get_storage(format, history=True).columnar else 'list'
         if market == 'DSE':
-            history_list = self.parse_price_history_dse(symbol)
+            history_list = self.parse_price_history_dse(symbol, output=output)
             full_path = os.path.join(file_path, file_name)
 
         elif market == 'CSE':
-            history_list = self.parse_price_history_cse(symbol)
+            history_list = self.parse_price_history_cse(symbol, output='frame')
             full_path = os.path.join(file_path, file_name)
         else:
             raise IOError('Invalid Stock Market! Possible values are- CSE, DSE')
-        self.save_excel(dict_list=history_list, csv_path=full_path)
+        with self.metrics.stage('write'):
+            self.save_data(history_list, full_path, format=format)
+        return len(history_list)
+
+    def update_history_data(
+        self,
+        symbol,
+        file_path='',
+        file_name='history_data.csv',
+        market='DSE',
+        format='excel'
+    ):
+        """
+        Append only the trading days missing from a saved history file.
+
+        For DSE only the date range after the last stored `DATE` is
+        requested from the archive. CSE serves a fixed 6 month window, so
+        the rows after the last stored date are kept from it. A missing
+        file is downloaded in full. Returns the number of new rows, all
+        the saved rows for a new file.
+        """
+        full_path = os.path.join(file_path, file_name)
+        if not os.path.exists(full_path):
+            return self.save_history_data(
+                symbol,
+                file_path=file_path,
+                file_name=file_name,
+                market=market,
+                format=format
+            )
+
+        df_history = get_storage(format, history=True).read(full_path)
+        history_dates = pd.to_datetime(df_history['DATE'])
+        last_date = history_dates.max().date()
+
+        if market == 'DSE':
+            start_date = last_date + datetime.timedelta(days=1)
+            if str(start_date) > self.get_date():
+                return 0
+            history_list = self.parse_price_history_dse(
+                symbol, start_date=start_date
+            )
+        elif market == 'CSE':
+            history_list = self.parse_price_history_cse(symbol, output='frame')
+        else:
+            raise IOError('Invalid Stock Market! Possible values are- CSE, DSE')
+
+        df_new = pd.DataFrame(history_list)
+        if df_new.empty:
+            return 0
+        df_new = df_new[pd.to_datetime(df_new['DATE']).dt.date > last_date]
+        if df_new.empty:
+            return 0
 
-    def save_current_data(self, file_path='', file_name='dsebd_current_data.csv', market='DSE'):
+        # keep the row order of the stored file, newest first or last
+        if history_dates.iloc[0] > history_dates.iloc[-1]:
+            df_history = pd.concat([df_new, df_history], ignore_index=True)
+        else:
+            df_history = pd.concat([df_history, df_new], ignore_index=True)
+        with self.metrics.stage('write'):
+            self.save_data(df_history, full_path, format=format)
+        return len(df_new)
+
+    def get_current_url(self, market='DSE'):
         if market == 'DSE':
-            # target_page = requests.get(self.CKT_BREAKER_URL_DSE)
-            # fp_data = BeautifulSoup(target_page.text, 'html.parser')
+            # fp_text = self.client.get_text(self.CKT_BREAKER_URL_DSE)
+            # fp_data = self.html_backend.load(fp_text)
             # fp_dict = self.parse_floor_prices_dse(fp_data)
-            target_page = requests.get(self.CURRENT_PRICE_URL_DSE)
-            bs_data = BeautifulSoup(target_page.text, 'html.parser')
-            current_data = self.parse_current_prices_dse(bs_data)
-            full_path = os.path.join(file_path, file_name)
+            return self.CURRENT_PRICE_URL_DSE
         elif market == 'CSE':
-            target_page = requests.get(self.CURRENT_PRICE_URL_CSE)
-            bs_data = BeautifulSoup(target_page.text, 'html.parser')
-            current_data = self.parse_current_prices_cse(bs_data)
-            full_path = os.path.join(file_path, file_name)
-        else:
+            return self.CURRENT_PRICE_URL_CSE
+        raise IOError('Invalid Stock Market! Possible values are- CSE, DSE')
+
+    def parse_current_page(self, page_text, market='DSE', output='list'):
+        with self.metrics.stage('parse'):
+            page_data = self.html_backend.load(page_text)
+        with self.metrics.stage('convert'):
+            if market == 'DSE':
+                return self.parse_current_prices_dse(page_data, output=output)
+            return self.parse_current_prices_cse(page_data, output=output)
+
+    def get_current_data(self, market='DSE', output='list'):
+        page_text = self.client.get_text(self.get_current_url(market))
+        return self.parse_current_page(page_text, market=market, output=output)
+
+    def save_current_data(
+        self,
+        file_path='',
+        file_name='dsebd_current_data.csv',
+        market='DSE',
+        format='excel'
+    ):
+        output = 'frame' if get_storage(format).columnar else 'list'
+        current_data = self.get_current_data(market=market, output=output)
+        full_path = os.path.join(file_path, file_name)
+        with self.metrics.stage('write'):
+            self.save_data(current_data, full_path, format=format)
+
+    @staticmethod
+    def current_to_history_rows(current_data):
+        """
+        Turn a latest price board into history rows. CLOSEP is taken from
+        LTP like the daily append job always did, and so is OPENP when the
+        board has no open price (DSE).
+        """
+        df = pd.DataFrame(current_data)
+        if df.empty:
+            return df
+        df = df.rename(columns={'OPEN': 'OPENP'})
+        if 'OPENP' not in df.columns:
+            df['OPENP'] = df['LTP']
+        df['CLOSEP'] = df['LTP']
+        columns = [
+            'DATE', 'TRADING_CODE', 'LTP', 'HIGH', 'LOW', 'OPENP', 'CLOSEP',
+            'YCP', 'TRADE', 'VALUE_MN', 'VOLUME',
+        ]
+        return to_typed_price_frame(df[columns])
+
+    def append_current_data(self, store, market='DSE', current_data=None):
+        """
+        Upsert today's row of every symbol into a PriceStore in one merge.
+
+        `current_data` is the output of `get_current_data()`. It is
+        downloaded when not given. Returns the number of rows written.
+        """
+        if current_data is None:
+            current_data = self.get_current_data(market=market, output='frame')
+        df_rows = self.current_to_history_rows(current_data)
+        with self.metrics.stage('write'):
+            return store.write(df_rows, market=market)
+
+    def save_history_data_bulk(
+        self,
+        symbols,
+        file_path='',
+        file_name='{symbol}_history_data.xlsx',
+        market='DSE',
+        max_workers=8,
+        rate_limit=2,
+        format='excel',
+    ):
+        """
+        Download and save history data of many symbols in parallel.
+
+        `file_name` is formatted with the symbol for each file and
+        `rate_limit` caps the number of requests started per second.
+        Returns a dict of symbol -> result dict with a `status` of
+        'ok' or 'error'.
+        """
+        if market not in ('DSE', 'CSE'):
             raise IOError('Invalid Stock Market! Possible values are- CSE, DSE')
-        self.save_excel(dict_list=current_data, csv_path=full_path)
+        limiter = RateLimiter(rate_limit)
+
+        def save_symbol(symbol):
+            limiter.wait()
+            self.save_history_data(
+                symbol,
+                file_path=file_path,
+                file_name=file_name.format(symbol=symbol),
+                market=market,
+                format=format
+            )
+            return os.path.join(file_path, file_name.format(symbol=symbol))
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(save_symbol, symbol): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    results[symbol] = {
+                        'status': 'ok',
+                        'path': future.result()
+                    }
+                except Exception as e:
+                    self.metrics.record_failure(symbol, e)
+                    results[symbol] = {
+                        'status': 'error',
+                        'error': str(e)
+                    }
+        return results
+
+    @staticmethod
+    def get_date_windows(start_date, end_date, window_days=30):
+        start_date = pd.Timestamp(start_date).date()
+        end_date = pd.Timestamp(end_date).date()
+        windows = []
+        while start_date <= end_date:
+            window_end = min(
+                start_date + datetime.timedelta(days=window_days - 1), end_date
+            )
+            windows.append((start_date, window_end))
+            start_date = window_end + datetime.timedelta(days=1)
+        return windows
+
+    def parse_market_history_dse(
+        self,
+        start_date,
+        end_date=None,
+        window_days=30,
+        rate_limit=2,
+        output='frame',
+    ):
+        """
+        Price history of all DSE instruments between `start_date` and
+        `end_date` (today when None). The archive is requested for all
+        instruments at once, one request per `window_days` days, instead
+        of one request per symbol. Returns a typed DataFrame sorted by
+        TRADING_CODE and DATE, or PriceBars with `output='bars'`.
+        """
+        end_date = end_date or self.get_date()
+        limiter = RateLimiter(rate_limit)
+        frames = []
+        for window_start, window_end in self.get_date_windows(
+            start_date, end_date, window_days=window_days
+        ):
+            limiter.wait()
+            frames.append(self.parse_price_history_dse(
+                self.ALL_INSTRUMENTS_DSE,
+                start_date=window_start,
+                end_date=window_end,
+                output='frame'
+            ))
+        df = pd.concat(frames, ignore_index=True)
+        df = df.drop_duplicates(subset=['TRADING_CODE', 'DATE'], keep='last')
+        df = df.sort_values(['TRADING_CODE', 'DATE']).reset_index(drop=True)
+        return self.to_output(df, output)
+
+    def save_market_history_data(
+        self,
+        start_date,
+        end_date=None,
+        store=None,
+        file_path='',
+        file_name='{symbol}_history_data.xlsx',
+        window_days=30,
+        rate_limit=2,
+        format='excel',
+    ):
+        """
+        Download the history of all DSE instruments for a date range with
+        `parse_market_history_dse()` and split it by symbol.
+
+        With a PriceStore as `store` the rows are upserted into it and
+        the number of rows written is returned. Otherwise every symbol is
+        saved to its own file, `file_name` formatted with the symbol, and
+        a dict of symbol -> result dict like `save_history_data_bulk()`
+        is returned.
+        """
+        df = self.parse_market_history_dse(
+            start_date,
+            end_date=end_date,
+            window_days=window_days,
+            rate_limit=rate_limit
+        )
+        if store is not None:
+            with self.metrics.stage('write'):
+                return store.write(df, market='DSE')
+
+        results = {}
+        for symbol, df_symbol in df.groupby('TRADING_CODE', sort=False):
+            full_path = os.path.join(file_path, file_name.format(symbol=symbol))
+            try:
+                with self.metrics.stage('write'):
+                    self.save_data(df_symbol, full_path, format=format)
+                results[symbol] = {
+                    'status': 'ok',
+                    'path': full_path
+                }
+            except Exception as e:
+                self.metrics.record_failure(symbol, e)
+                results[symbol] = {
+                    'status': 'error',
+                    'error': str(e)
+                }
+        return results
+
+    async def afetch_history(
+        self,
+        symbol,
+        market='DSE',
+        start_date=None,
+        end_date=None,
+        output='list'
+    ):
+        """
+        Async `parse_price_history_dse()`/`parse_price_history_cse()`.
+        The page is downloaded with the AsyncHttpClient and parsed by the
+        same functions. The dates are only used for DSE.
+
+        `parse_history_page_dse()` and `parse_cse_graph()` run synchronously
+        inside the coroutine, other tasks of the loop wait while a page is
+        parsed.
+        """
+        client = self.get_async_client()
+        if market == 'DSE':
+            page_text = await client.get_text(self.get_history_url_dse(
+                symbol, start_date=start_date, end_date=end_date
+            ))
+            return self.parse_history_page_dse(page_text, output=output)
+        elif market == 'CSE':
+            page_text = await client.get_text(self.HISTORY_URL_CSE + symbol)
+            with self.metrics.stage('parse'):
+                return self.parse_cse_graph(page_text, symbol, output=output)
+        raise IOError('Invalid Stock Market! Possible values are- CSE, DSE')
+
+    async def afetch_current(self, market='DSE', output='list'):
+        """
+        Async `get_current_data()`. The page is parsed synchronously
+        inside the coroutine.
+        """
+        page_text = await self.get_async_client().get_text(
+            self.get_current_url(market)
+        )
+        return self.parse_current_page(page_text, market=market, output=output)
+
+    async def afetch_history_bulk(self, symbols, market='DSE', output='list'):
+        """
+        Download the history of many symbols concurrently on one event
+        loop. The number of requests in flight is capped by the async
+        client, the pages are parsed synchronously one at a time as they
+        arrive. Returns a dict of symbol -> result dict with a `status`
+        of 'ok' (and the parsed `data`) or 'error'.
+        """
+        if market not in ('DSE', 'CSE'):
+            raise IOError('Invalid Stock Market! Possible values are- CSE, DSE')
+        symbols = list(symbols)
+        history = await asyncio.gather(*[
+            self.afetch_history(symbol, market=market, output=output)
+            for symbol in symbols
+        ], return_exceptions=True)
+        results = {}
+        for symbol, data in zip(symbols, history):
+            if isinstance(data, Exception):
+                self.metrics.record_failure(symbol, data)
+                results[symbol] = {
+                    'status': 'error',
+                    'error': str(data)
+                }
+            else:
+                results[symbol] = {
+                    'status': 'ok',
+                    'data': data
+                }
+        return results
+
+    async def aclose(self):
+        if self.async_client is not None:
+            await self.async_client.aclose()
+        self.reset_async_client()
@@ -3,18 +3,108 @@
 __author__ = "Sk Farhad"
 __copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
 
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import numpy as np
 import pandas as pd
-import mplfinance as mplf
-from matplotlib import pyplot as plt
-from pyti.bollinger_bands import upper_bollinger_band as bb_up
-from pyti.bollinger_bands import middle_bollinger_band as bb_mid
-from pyti.bollinger_bands import lower_bollinger_band as bb_low
-from pyti.relative_strength_index import relative_strength_index as RSI
-from tapy import Indicators
+
+from . import indicators
+from .lazy_import import LazyModule
+from .resampler import Resampler, to_ohlc_frame
+from .storage import get_storage, infer_format
+
+
+# matplotlib and mplfinance take most of the import time of the package,
+# they are loaded when the first chart is made
+mplf = LazyModule('mplfinance')
+plt = LazyModule('matplotlib.pyplot')
+
+
+def use_agg_backend():
+    plt.switch_backend('Agg')
+
+
+def render_symbol_charts(
+    file_path,
+    symbol,
+    timeframes,
+    out_dir,
+    data_n,
+    plot_kwargs
+):
+    # a failed timeframe doesn't stop the others of the symbol
+    results = {}
+    for step in timeframes:
+        try:
+            cd_plot = CandlestickPlot(file_path, symbol, **plot_kwargs)
+            fig, _ = cd_plot.get_candlestick_fig(
+                data_n=data_n, resample=step != '1D', step=step
+            )
+            try:
+                out_path = os.path.join(out_dir, f'{symbol}_{step}.png')
+                fig.savefig(out_path)
+            finally:
+                plt.close(fig)
+            results[step] = {
+                'status': 'ok',
+                'path': out_path
+            }
+        except Exception as e:
+            results[step] = {
+                'status': 'error',
+                'error': str(e)
+            }
+    return results
+
+
+class IndicatorCache(object):
+    """
+    LRU cache of processed price data and full-length indicator series.
+
+    Entries are evicted, least recently used first, once their total
+    memory use passes `max_bytes`.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_size(value):
+        return int(sum(df.memory_usage(deep=True).sum() for df in value))
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+    def put(self, key, value):
+        size = self.get_size(value)
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, old_size) = self.entries.popitem(last=False)
+                self.total_bytes -= old_size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
 
 
 class CandlestickPlot(object):
+    # styles are built once per process for every colour pair
+    NC_STYLES = {}
 
     def __init__(
         self,
@@ -26,9 +116,14 @@ class CandlestickPlot(object):
         macd_smooth=7,
         rsi_period=10,
         bb_period=10,
+        indicator_cache=None,
+        resampler=None,
     ):
         self.file_path = file_path
         self.data = None
+        self.indicator_data = None
+        self.indicator_cache = indicator_cache
+        self.resampler = resampler
         self.data_n = data_n
         self.plots = []
         self.symbol = symbol
@@ -40,42 +135,17 @@ class CandlestickPlot(object):
         self.rsi_period = rsi_period
         self.bb_period = bb_period
 
-    def get_macd(self, data):
-        macd_n = self.data_n + max(self.macd_slow, self.macd_fast)
-        macd_data = data[-macd_n:]
-        fast_ema = macd_data.ewm(
-            span=self.macd_fast, min_periods=self.macd_slow
-        ).mean()
-        slow_ema = macd_data.ewm(
-            span=self.macd_slow, min_periods=self.macd_slow
-        ).mean()
-        macd = pd.Series(fast_ema - slow_ema, name='macd')
-        macd_sig = pd.Series(
-            macd.ewm(span=self.macd_smooth,min_periods=self.macd_smooth).mean(),
-            name='macd_sig'
-        )
-        macd_hist = pd.Series(macd - macd_sig, name='macd_hist')
-
-        return macd[-self.data_n:], macd_sig[-self.data_n:], macd_hist[-self.data_n:]
-
     @staticmethod
     def get_weekly(df, step='3D'):
-        agg_dict = {
-            'Open': 'first',
-            'High': 'max',
-            'Low': 'min',
-            'Close': 'last',
-            'Trade': 'mean',
-            'Volume': 'mean'
-        }
-
         # resampled dataframe
-        # 'W' means weekly aggregation
-        df = df.resample(step).agg(agg_dict)
+        # 'W' means weekly aggregation of Sunday to Thursday
+        df = df.resample(Resampler.get_rule(step)).agg(Resampler.AGG_DICT)
         return df
 
     def get_nc_style(self):
         color_up, color_down = self.color_up, self.color_down
+        if (color_up, color_down) in self.NC_STYLES:
+            return self.NC_STYLES[(color_up, color_down)]
         ncs = mplf.make_mpf_style(
             base_mpf_style='nightclouds',
             marketcolors={
@@ -89,50 +159,105 @@ class CandlestickPlot(object):
             },
             mavcolors=['gray', 'sienna', 'darkslategray', 'purple'],
         )
+        self.NC_STYLES[(color_up, color_down)] = ncs
         return ncs
 
-    def process_data_mpl(self, resample=False, step='3D', vol_key='VOLUME'):
-        df = pd.read_excel(self.file_path)
-        columns = ['DATE', 'CLOSEP', vol_key, 'HIGH', 'LOW', 'OPENP', 'TRADE']
-        df = df[columns]
-        df = df.rename(columns={
-            'DATE': 'Date',
-            'OPENP': 'Open',
-            'CLOSEP': 'Close',
-            vol_key: 'Volume',
-            'TRADE': 'Trade',
-            'HIGH': 'High',
-            'LOW': 'Low'
-        }, inplace=False)
-
-        df = df[df['Open'] > 0]
-        df = df[df['High'] > 0]
-        df = df[df['Close'] > 0]
-
-        df['Date'] = pd.to_datetime(df['Date'])
-        if resample:
-            df.index = pd.DatetimeIndex(df['Date'])
-            df = self.get_weekly(df, step=step)
-            df.reset_index(level=0, inplace=True)
-            df.sort_values(by='Date', inplace=True)
-            df.index = pd.DatetimeIndex(df['Date'])
-            df.dropna(inplace=True)
-        else:
+    def read_daily_data(self, vol_key='VOLUME', format=None):
+        storage = get_storage(format or infer_format(self.file_path), history=True)
+        return to_ohlc_frame(storage.read(self.file_path), vol_key=vol_key)
 
-            df.sort_values(by='Date', inplace=True)
-            # df.reset_index(inplace=True)
-            df.index = pd.DatetimeIndex(df['Date'])
-        self.data = df
+    def process_data_mpl(
+        self,
+        resample=False,
+        step='3D',
+        vol_key='VOLUME',
+        format=None
+    ):
+        self.indicator_data = None
+        if not resample:
+            self.data = self.read_daily_data(vol_key=vol_key, format=format)
+        elif self.resampler is not None:
+            self.data = self.resampler.get_bars(
+                self.file_path,
+                step,
+                lambda: self.read_daily_data(vol_key=vol_key, format=format),
+                vol_key=vol_key
+            )
+        else:
+            self.data = Resampler.resample(
+                self.read_daily_data(vol_key=vol_key, format=format), step=step
+            )
         return
 
+    def get_indicator_frame(self, data):
+        close = data['Close']
+        bb_upper, bb_middle, bb_lower = indicators.bollinger_bands(
+            close, self.bb_period
+        )
+        macd, macd_sig, macd_hist = indicators.macd(
+            close, self.macd_fast, self.macd_slow, self.macd_smooth
+        )
+        fr_high, fr_low = indicators.fractals(data['High'], data['Low'])
+        return pd.DataFrame({
+            'bb_upper': bb_upper,
+            'bb_middle': bb_middle,
+            'bb_lower': bb_lower,
+            'rsi': indicators.rsi(close, self.rsi_period),
+            'macd': macd,
+            'macd_sig': macd_sig,
+            'macd_hist': macd_hist,
+            'fr_high': fr_high,
+            'fr_low': fr_low,
+        }, index=data.index)
+
+    def get_indicator_data(self):
+        # indicators are always computed on the whole history and then
+        # sliced, so every data_n window shows the same values
+        if self.indicator_data is None:
+            self.indicator_data = self.get_indicator_frame(self.data)
+        return self.indicator_data
+
+    def load_data(self, resample=False, step='3D', vol_key='VOLUME', format=None):
+        """
+        Load the price data like `process_data_mpl` and compute its
+        full-length indicators, every `data_n` window is sliced from them.
+        With an indicator cache both are computed once per file version,
+        timeframe and indicator parameters.
+        """
+        self.indicator_data = None
+        if self.indicator_cache is None:
+            self.process_data_mpl(
+                resample=resample, step=step, vol_key=vol_key, format=format
+            )
+            self.get_indicator_data()
+            return
+        key = (
+            os.path.abspath(self.file_path),
+            os.path.getmtime(self.file_path),
+            step if resample else '1D',
+            vol_key,
+            self.macd_fast,
+            self.macd_slow,
+            self.macd_smooth,
+            self.rsi_period,
+            self.bb_period,
+        )
+        entry = self.indicator_cache.get(key)
+        if entry is None:
+            self.process_data_mpl(
+                resample=resample, step=step, vol_key=vol_key, format=format
+            )
+            entry = (self.data, self.get_indicator_data())
+            self.indicator_cache.put(key, entry)
+        self.data, self.indicator_data = entry
+
     def add_bb_plots(self, panel=0):
-        data, plots = self.data, self.plots
-        bb_n = self.data_n + self.bb_period
-        bb_data = data[-bb_n:]
-        data_cl = bb_data['Close'].values.tolist()
-        bb_u = bb_up(data_cl, self.bb_period)[-self.data_n:]
-        bb_l = bb_low(data_cl, self.bb_period)[-self.data_n:]
-        bb_m = bb_mid(data_cl, self.bb_period)[-self.data_n:]
+        plots = self.plots
+        ind_data = self.get_indicator_data()[-self.data_n:]
+        bb_u, bb_m, bb_l = (
+            ind_data[col].values
+            for col in ('bb_upper', 'bb_middle', 'bb_lower')
+        )
 
         bb_m_plot = mplf.make_addplot(bb_m, panel=panel, color='cyan', width=1, alpha=0.5)
         bb_l_plot = mplf.make_addplot(bb_l, panel=panel, color='yellow', width=1, alpha=0.3)
@@ -142,9 +267,12 @@ class CandlestickPlot(object):
         ])
 
     def add_macd_plots(self, panel=1):
-        data, plots = self.data, self.plots
+        plots = self.plots
         color_up, color_down = self.color_up, self.color_down
-        macd, macd_signal, macd_hist = self.get_macd(data['Close'])
+        ind_data = self.get_indicator_data()[-self.data_n:]
+        macd, macd_signal, macd_hist = (
+            ind_data['macd'], ind_data['macd_sig'], ind_data['macd_hist']
+        )
 
         colors = [color_up if v >= 0 else color_down for v in macd_hist]
         macd_plot = mplf.make_addplot(
@@ -167,11 +295,9 @@ class CandlestickPlot(object):
         ])
 
     def add_rsi_plot(self, panel=0):
-        data, plots = self.data, self.plots
-        rsi_n = self.data_n + self.rsi_period
-        rsi_data = data[-rsi_n:]
+        plots = self.plots
         color_up, color_down = self.color_up, self.color_down
-        rsi = RSI(rsi_data['Close'], period=self.rsi_period)[-self.data_n:]
+        rsi = self.get_indicator_data()['rsi'].values[-self.data_n:]
 
         line_rsi = mplf.make_addplot(
             rsi, panel=panel, color='gray', ylabel='RSI', width=1.5,
@@ -198,14 +324,13 @@ class CandlestickPlot(object):
         color_up, color_down = self.color_up, self.color_down
         data, plots = self.data, self.plots
         vol_data = data[-self.data_n:]
-        vol_colors = vol_data.apply(
-            lambda x: color_up if x['Close'] > x['Open'] else color_down,
-            axis=1
+        vol_colors = np.where(
+            vol_data['Close'] > vol_data['Open'], color_up, color_down
         )
         volume_plot = mplf.make_addplot(
             vol_data['Volume'],
             panel=vol_panel,
-            color=vol_colors.values,
+            color=vol_colors.tolist(),
             type='bar',
             ylabel='Volume',
         )
@@ -215,19 +340,18 @@ class CandlestickPlot(object):
         data, plots = self.data, self.plots
         color_up, color_down = self.color_up, self.color_down
         fr_data = data[-self.data_n:]
-        ind = Indicators(fr_data)
-        ind.fractals(column_name_high='fr_high', column_name_low='fr_low')
-        fr_data = ind.df
-        fr_data['fr_high'] = fr_data.apply(lambda x: x['Close'] * 1.08 if x['fr_high'] else np.nan, axis=1)
-        fr_data['fr_low'] = fr_data.apply(lambda x: x['Close'] * 0.92 if x['fr_low'] else np.nan, axis=1)
+        ind_data = self.get_indicator_data()[-self.data_n:]
+        fr_high, fr_low = ind_data['fr_high'], ind_data['fr_low']
+        fr_high_line = (fr_data['Close'] * 1.08).where(fr_high)
+        fr_low_line = (fr_data['Close'] * 0.92).where(fr_low)
 
         fr_high_plot = mplf.make_addplot(
-            fr_data['fr_high'], panel=panel,
+            fr_high_line, panel=panel,
             color=color_down, width=1, type='step', alpha=.9,
             secondary_y=False,
         )
         fr_low_plot = mplf.make_addplot(
-            fr_data['fr_low'], panel=panel,
+            fr_low_line, panel=panel,
             color=color_up, width=1, type='step', alpha=.9,
             secondary_y=False,
 
@@ -235,6 +359,7 @@ class CandlestickPlot(object):
         plots.extend([fr_high_plot, fr_low_plot])
 
     def create_candlestick_chart(self, step='1D'):
+        self.plots = []
         self.add_rsi_plot(panel=0)
         self.add_bb_plots(panel=1)
         self.add_fractal_plot(panel=1)
@@ -262,7 +387,7 @@ class CandlestickPlot(object):
         return fig, axlist
 
     def show_plot(self, data_n=120, resample=False, step='1D'):
-        self.process_data_mpl(resample=resample, step=step)
+        self.load_data(resample=resample, step=step)
         self.data_n = data_n
         if not resample:
             step = '1D'
@@ -270,9 +395,77 @@ class CandlestickPlot(object):
         plt.show()
 
     def get_candlestick_fig(self, data_n=120, resample=False, step='1D'):
-        self.process_data_mpl(resample=resample, step=step)
+        self.load_data(resample=resample, step=step)
         self.data_n = data_n
         if not resample:
             step = '1D'
         fig, axlist = self.create_candlestick_chart(step=step)
         return fig, axlist
+
+    @classmethod
+    def render_many(
+        cls,
+        symbols,
+        timeframes=('1D',),
+        out_dir='',
+        data_dir='',
+        file_name='{symbol}_history_data.xlsx',
+        workers=None,
+        data_n=120,
+        **plot_kwargs
+    ):
+        """
+        Save PNG charts of every symbol and timeframe with a process pool.
+
+        The history file of a symbol is `file_name` formatted with the
+        symbol inside `data_dir`. Charts are saved as
+        `<out_dir>/<symbol>_<timeframe>.png`, where '1D' means daily bars
+        and other timeframes like '3D' or 'W' are resampled.
+        Returns a dict of symbol -> result dict. Its `timeframes` hold
+        the result of every chart, `files` the paths of the saved ones
+        and `status` is 'ok' when all of them were saved, else 'error'.
+        """
+        results = {}
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=use_agg_backend
+        ) as executor:
+            futures = {
+                executor.submit(
+                    render_symbol_charts,
+                    os.path.join(data_dir, file_name.format(symbol=symbol)),
+                    symbol,
+                    list(timeframes),
+                    out_dir,
+                    data_n,
+                    plot_kwargs,
+                ): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    charts = future.result()
+                except Exception as e:
+                    # the worker itself failed, no chart of the symbol is known
+                    results[symbol] = {
+                        'status': 'error',
+                        'error': str(e),
+                        'files': [],
+                        'timeframes': {},
+                    }
+                    continue
+                errors = [
+                    f"{step}: {chart['error']}" for step, chart in charts.items()
+                    if chart['status'] == 'error'
+                ]
+                results[symbol] = {
+                    'status': 'error' if errors else 'ok',
+                    'files': [
+                        chart['path'] for chart in charts.values()
+                        if chart['status'] == 'ok'
+                    ],
+                    'timeframes': charts,
+                }
+                if errors:
+                    results[symbol]['error'] = '; '.join(errors)
+        return results
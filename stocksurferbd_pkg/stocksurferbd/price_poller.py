@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import asyncio
+import csv
+import datetime
+import inspect
+import os
+
+import pandas as pd
+
+from .price_data_scraper import PriceData
+
+
+DHAKA_TZ = datetime.timezone(datetime.timedelta(hours=6), 'Asia/Dhaka')
+
+
+class TickStore(object):
+    """
+    Appends price ticks to one CSV file per market and day-
+    `<root_path>/DSE_2024-05-02_ticks.csv`. Each tick only writes the
+    rows that changed.
+    """
+    COLUMNS = [
+        'TIME', 'TRADING_CODE', 'LTP', 'HIGH', 'LOW', 'YCP', 'TRADE',
+        'VALUE_MN', 'VOLUME',
+    ]
+
+    def __init__(self, root_path):
+        self.root_path = root_path
+        os.makedirs(root_path, exist_ok=True)
+
+    def get_path(self, market, tick_time):
+        return os.path.join(
+            self.root_path, f'{market}_{tick_time.date()}_ticks.csv'
+        )
+
+    def append(self, rows, market, tick_time):
+        path = self.get_path(market, tick_time)
+        new_file = not os.path.exists(path)
+        time_txt = tick_time.isoformat(timespec='seconds')
+        with open(path, 'a', newline='') as tick_file:
+            writer = csv.writer(tick_file)
+            if new_file:
+                writer.writerow(self.COLUMNS)
+            for row in rows:
+                writer.writerow(
+                    [time_txt] + [row.get(col) for col in self.COLUMNS[1:]]
+                )
+
+    def read(self, market, date):
+        path = os.path.join(self.root_path, f'{market}_{date}_ticks.csv')
+        return pd.read_csv(path, parse_dates=['TIME'])
+
+
+class PricePoller(object):
+    """
+    Polls the latest price board of DSE or CSE every `interval` seconds.
+
+    The latest row of every symbol is kept in `snapshot`. Each poll only
+    reports the rows that changed since the previous poll, passes them to
+    `on_change` and appends them to `tick_store`. Polls are skipped
+    outside trading hours (Sunday-Thursday, Dhaka time) unless
+    `market_hours_only` is False. Failed polls are counted as
+    `poll_failures` in the metrics of `price_data`.
+    """
+    TRADING_DAYS = (6, 0, 1, 2, 3)
+    TRADING_HOURS = (datetime.time(10, 0), datetime.time(14, 30))
+
+    def __init__(
+        self,
+        price_data=None,
+        market='DSE',
+        interval=60,
+        tick_store=None,
+        market_hours_only=True,
+    ):
+        if market not in ('DSE', 'CSE'):
+            raise IOError('Invalid Stock Market! Possible values are- CSE, DSE')
+        self.price_data = price_data if price_data is not None else PriceData()
+        self.market = market
+        self.interval = interval
+        self.tick_store = tick_store
+        self.market_hours_only = market_hours_only
+        self.snapshot = {}
+
+    def is_market_open(self, now=None):
+        now = now or datetime.datetime.now(DHAKA_TZ)
+        start_time, end_time = self.TRADING_HOURS
+        return (
+            now.weekday() in self.TRADING_DAYS
+            and start_time <= now.time() <= end_time
+        )
+
+    def get_changes(self, current_data):
+        changed_rows = []
+        for row in current_data:
+            symbol = row['TRADING_CODE']
+            if self.snapshot.get(symbol) != row:
+                self.snapshot[symbol] = row
+                changed_rows.append(row)
+        return changed_rows
+
+    def get_snapshot(self):
+        return pd.DataFrame(list(self.snapshot.values()))
+
+    async def poll_once(self):
+        current_data = await asyncio.to_thread(
+            self.price_data.get_current_data, self.market
+        )
+        tick_time = datetime.datetime.now(DHAKA_TZ)
+        changed_rows = self.get_changes(current_data)
+        if changed_rows and self.tick_store is not None:
+            await asyncio.to_thread(
+                self.tick_store.append, changed_rows, self.market, tick_time
+            )
+        return changed_rows
+
+    async def run(self, on_change=None, max_polls=None):
+        loop = asyncio.get_running_loop()
+        poll_count = 0
+        while True:
+            started = loop.time()
+            if not self.market_hours_only or self.is_market_open():
+                poll_count += 1
+                try:
+                    changed_rows = await self.poll_once()
+                except Exception as e:
+                    self.price_data.metrics.add('poll_failures')
+                    self.price_data.metrics.record_failure(self.market, e)
+                    changed_rows = []
+                if changed_rows and on_change is not None:
+                    result = on_change(changed_rows)
+                    if inspect.isawaitable(result):
+                        await result
+                if max_polls is not None and poll_count >= max_polls:
+                    break
+            await asyncio.sleep(max(0, self.interval - (loop.time() - started)))
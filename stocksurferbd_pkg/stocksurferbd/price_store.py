@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import os
+import threading
+
+import pandas as pd
+
+from .price_bars import PriceBars
+from .storage import get_storage, infer_format, to_typed_price_frame
+
+
+class PriceStore(object):
+    """
+    One market-wide price dataset instead of a file per symbol.
+
+    Rows are kept in Parquet files partitioned by market and year-
+    `<root_path>/market=DSE/year=2024.parquet`, sorted on
+    (TRADING_CODE, DATE). Queries only open the years they need and
+    skip row groups of other symbols/dates, and results are indexed
+    on (TRADING_CODE, DATE).
+    """
+    MARKETS = ('DSE', 'CSE')
+    KEY_COLUMNS = ['TRADING_CODE', 'DATE']
+    ROW_GROUP_SIZE = 20000
+
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self.lock = threading.Lock()
+
+    def check_market(self, market):
+        if market not in self.MARKETS:
+            raise IOError('Invalid Stock Market! Possible values are- CSE, DSE')
+
+    def get_market_path(self, market):
+        return os.path.join(self.root_path, f'market={market}')
+
+    def get_partition_path(self, market, year):
+        return os.path.join(self.get_market_path(market), f'year={year}.parquet')
+
+    def get_years(self, market='DSE'):
+        self.check_market(market)
+        market_path = self.get_market_path(market)
+        if not os.path.isdir(market_path):
+            return []
+        years = []
+        for name in os.listdir(market_path):
+            if name.startswith('year=') and name.endswith('.parquet'):
+                years.append(int(name[len('year='):-len('.parquet')]))
+        return sorted(years)
+
+    def read_partition(self, market, year, filters=None, columns=None):
+        path = self.get_partition_path(market, year)
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path, filters=filters, columns=columns)
+
+    def write_partition(self, df, market, year):
+        os.makedirs(self.get_market_path(market), exist_ok=True)
+        path = self.get_partition_path(market, year)
+        tmp_path = path + '.tmp'
+        df.to_parquet(tmp_path, index=False, row_group_size=self.ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
+
+    def write(self, df, market='DSE'):
+        """
+        Insert or update price rows, given as a DataFrame, row dicts or
+        PriceBars. Rows with an existing (TRADING_CODE, DATE) replace
+        the stored row.
+        Returns the number of rows written.
+        """
+        self.check_market(market)
+        if isinstance(df, PriceBars):
+            df = df.to_frame()
+        df = pd.DataFrame(df)
+        if 'TRADING_CODE' in (df.index.names or []):
+            df = df.reset_index()
+        df = to_typed_price_frame(df.reset_index(drop=True))
+        if df.empty:
+            return 0
+        with self.lock:
+            for year, df_year in df.groupby(df['DATE'].dt.year):
+                df_stored = self.read_partition(market, year)
+                if df_stored is not None:
+                    df_year = pd.concat([df_stored, df_year], ignore_index=True)
+                df_year = df_year.drop_duplicates(
+                    subset=self.KEY_COLUMNS, keep='last'
+                ).sort_values(self.KEY_COLUMNS).reset_index(drop=True)
+                self.write_partition(df_year, market, year)
+        return len(df)
+
+    def import_history_data(self, full_path, market='DSE', format=None):
+        storage = get_storage(format or infer_format(full_path), history=True)
+        return self.write(storage.read(full_path), market=market)
+
+    def read(
+        self,
+        market='DSE',
+        symbols=None,
+        start_date=None,
+        end_date=None,
+        columns=None
+    ):
+        """
+        Price rows of `symbols` (all when None) between `start_date` and
+        `end_date` inclusive, indexed on (TRADING_CODE, DATE).
+        """
+        years = self.get_years(market)
+        start_date = pd.Timestamp(start_date) if start_date is not None else None
+        end_date = pd.Timestamp(end_date) if end_date is not None else None
+        if start_date is not None:
+            years = [y for y in years if y >= start_date.year]
+        if end_date is not None:
+            years = [y for y in years if y <= end_date.year]
+
+        filters = []
+        if symbols is not None:
+            if isinstance(symbols, str):
+                symbols = [symbols]
+            filters.append(('TRADING_CODE', 'in', list(symbols)))
+        if start_date is not None:
+            filters.append(('DATE', '>=', start_date))
+        if end_date is not None:
+            filters.append(('DATE', '<=', end_date))
+        if columns is not None:
+            columns = self.KEY_COLUMNS + [
+                c for c in columns if c not in self.KEY_COLUMNS
+            ]
+
+        frames = []
+        for year in years:
+            df_year = self.read_partition(
+                market, year, filters=filters or None, columns=columns
+            )
+            if df_year is not None and len(df_year):
+                frames.append(df_year)
+        if not frames:
+            return pd.DataFrame(columns=columns or self.KEY_COLUMNS).set_index(
+                self.KEY_COLUMNS
+            )
+        df = pd.concat(frames, ignore_index=True)
+        return df.set_index(self.KEY_COLUMNS).sort_index()
+
+    def read_symbol(
+        self,
+        symbol,
+        market='DSE',
+        start_date=None,
+        end_date=None,
+        columns=None
+    ):
+        return self.read(
+            market=market,
+            symbols=[symbol],
+            start_date=start_date,
+            end_date=end_date,
+            columns=columns
+        )
+
+    def read_date(self, date, market='DSE', symbols=None, columns=None):
+        return self.read(
+            market=market,
+            symbols=symbols,
+            start_date=date,
+            end_date=date,
+            columns=columns
+        )
+
+    def get_symbols(self, market='DSE'):
+        symbols = set()
+        for year in self.get_years(market):
+            df_year = self.read_partition(market, year, columns=['TRADING_CODE'])
+            symbols.update(df_year['TRADING_CODE'].unique())
+        return sorted(symbols)
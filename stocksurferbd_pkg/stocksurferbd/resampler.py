@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import hashlib
+import os
+
+import pandas as pd
+
+
+def to_ohlc_frame(df, vol_key='VOLUME', with_symbol=False):
+    """
+    Daily price rows as a Date indexed Open/High/Low/Close/Volume/Trade
+    frame, sorted by date and without rows of zero prices. TRADING_CODE
+    is kept with `with_symbol=True`.
+    """
+    columns = ['DATE', 'CLOSEP', vol_key, 'HIGH', 'LOW', 'OPENP', 'TRADE']
+    if with_symbol:
+        columns.append('TRADING_CODE')
+    df = df[columns]
+    df = df.rename(columns={
+        'DATE': 'Date',
+        'OPENP': 'Open',
+        'CLOSEP': 'Close',
+        vol_key: 'Volume',
+        'TRADE': 'Trade',
+        'HIGH': 'High',
+        'LOW': 'Low'
+    }, inplace=False)
+
+    df = df[df['Open'] > 0]
+    df = df[df['High'] > 0]
+    df = df[df['Close'] > 0]
+
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.sort_values(by='Date')
+    df.index = pd.DatetimeIndex(df['Date'])
+    return df
+
+
+class Resampler(object):
+    """
+    Aggregates daily bars into timeframes like '3D', 'W' and 'M'.
+
+    'W' is the DSE/CSE trading week from Sunday to Thursday, labelled
+    with its Thursday, and 'M' is the calendar month labelled with its
+    last day. Other steps are passed to pandas as they are. With a
+    Resampler object the bars of a history file are cached next to it
+    as `<file>_<step>.parquet` and only the last bars are recomputed
+    when rows are appended to the file. A file whose earlier rows
+    changed, e.g. rewritten with another date range, is resampled in
+    full.
+    """
+    STEP_RULES = {
+        'W': 'W-THU',
+        'M': 'ME',
+    }
+    RIGHT_LABELLED_RULES = ('W', 'ME', 'QE', 'YE')
+    AGG_DICT = {
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Trade': 'mean',
+        'Volume': 'mean'
+    }
+
+    @classmethod
+    def get_rule(cls, step):
+        return cls.STEP_RULES.get(step, step)
+
+    @classmethod
+    def is_right_labelled(cls, step):
+        return cls.get_rule(step).split('-')[0] in cls.RIGHT_LABELLED_RULES
+
+    @classmethod
+    def resample(cls, df, step='3D', origin='start_day'):
+        bars = df.resample(cls.get_rule(step), origin=origin).agg(cls.AGG_DICT)
+        bars = bars.dropna()
+        bars.insert(0, 'Date', bars.index)
+        return bars
+
+    @classmethod
+    def build(cls, df, steps=('3D', 'W', 'M')):
+        """
+        Bars of every step from one daily frame. '1D' gives the daily
+        frame itself.
+        """
+        return {
+            step: df if step == '1D' else cls.resample(df, step)
+            for step in steps
+        }
+
+    @classmethod
+    def build_market(cls, df, steps=('3D', 'W', 'M')):
+        """
+        Bars of every step for all symbols of a daily frame with a
+        TRADING_CODE column (`to_ohlc_frame(df, with_symbol=True)`),
+        indexed on (TRADING_CODE, Date).
+        """
+        grouped = df.groupby('TRADING_CODE')
+        all_bars = {}
+        for step in steps:
+            if step == '1D':
+                bars = df.drop(columns=['Date']).set_index(
+                    'TRADING_CODE', append=True
+                ).swaplevel().sort_index()
+            else:
+                bars = grouped.resample(cls.get_rule(step)).agg(cls.AGG_DICT)
+            all_bars[step] = bars.dropna()
+        return all_bars
+
+    @classmethod
+    def update(cls, bars, df, step='3D'):
+        """
+        Bring `bars` up to date with the daily frame `df` they were built
+        from after new rows were appended to it. Only the last bar and
+        the bars after it are recomputed.
+        """
+        if bars.empty or df.empty:
+            return cls.resample(df, step)
+        if cls.is_right_labelled(step):
+            # a bar covers the days after the previous bar's label
+            if len(bars) < 2:
+                return cls.resample(df, step)
+            keep_bars = bars.iloc[:-1]
+            tail = df[df.index > keep_bars.index[-1]]
+            new_bars = cls.resample(tail, step)
+        else:
+            # a bar covers the days from its label, counted from the
+            # first day of the full history
+            last_label = bars.index[-1]
+            keep_bars = bars.iloc[:-1]
+            tail = df[df.index >= last_label]
+            new_bars = cls.resample(
+                tail, step, origin=df.index[0].normalize()
+            )
+        return pd.concat([keep_bars, new_bars])
+
+    @staticmethod
+    def get_cache_path(file_path, step, vol_key='VOLUME'):
+        base_path = os.path.splitext(file_path)[0]
+        if vol_key != 'VOLUME':
+            base_path += '_' + vol_key
+        return f'{base_path}_{step}.parquet'
+
+    @classmethod
+    def get_rows_hash(cls, df):
+        values = pd.util.hash_pandas_object(df[list(cls.AGG_DICT)], index=True)
+        return hashlib.sha1(values.to_numpy().tobytes()).hexdigest()
+
+    def get_bars(self, file_path, step, load_daily, vol_key='VOLUME'):
+        """
+        Cached bars of a history file. `load_daily` returns the daily
+        frame of the file and is only called when the cache is missing
+        or older than the file.
+
+        The cache keeps the number and a hash of the daily rows it was
+        built from. The bars are only updated when those rows are still
+        the first rows of the file, otherwise they are built again.
+        """
+        cache_path = self.get_cache_path(file_path, step, vol_key=vol_key)
+        cache_exists = os.path.exists(cache_path)
+        if cache_exists and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+            return self.read_bars(cache_path)
+
+        df = load_daily()
+        bars = None
+        if cache_exists:
+            cached_bars = self.read_bars(cache_path)
+            n_rows = cached_bars.attrs.get('daily_rows')
+            if (
+                n_rows is not None
+                and n_rows <= len(df)
+                and cached_bars.attrs.get('daily_hash') == self.get_rows_hash(df.iloc[:n_rows])
+            ):
+                # rows were only appended to the file
+                bars = self.update(cached_bars, df, step)
+        if bars is None:
+            bars = self.resample(df, step)
+        bars.attrs = {
+            'daily_rows': len(df),
+            'daily_hash': self.get_rows_hash(df),
+        }
+        bars.to_parquet(cache_path, index=False)
+        return bars
+
+    @staticmethod
+    def read_bars(cache_path):
+        bars = pd.read_parquet(cache_path)
+        bars.index = pd.DatetimeIndex(bars['Date'])
+        return bars
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import numpy as np
+import pandas as pd
+
+from .storage import get_storage, infer_format, to_typed_price_frame
+
+
+PRICE_COLUMNS = ['OPENP', 'HIGH', 'LOW', 'CLOSEP', 'VOLUME']
+
+
+def to_number(values):
+    return pd.to_numeric(
+        values.astype(str).str.replace(',', '', regex=False), errors='coerce'
+    )
+
+
+def fundamentals_frame(company_data, financial_data=None):
+    """
+    One row of fundamentals per symbol- sector, market_cap and eps, from
+    the frames of `FundamentalData.get_company_data_bulk()`. eps is taken
+    from the latest year of `financial_data` when it is given, otherwise
+    from the yearly EPS of the company snapshot.
+    """
+    df = pd.DataFrame({
+        'TRADING_CODE': company_data['symbol'].astype(str),
+        'sector': company_data['sector'],
+        'market_cap': to_number(company_data['market_cap']),
+        'eps': to_number(company_data['eps_basic_yr']),
+    })
+    if financial_data is not None and len(financial_data):
+        fin = financial_data[['symbol', 'year', 'eps_original']].copy()
+        fin['year'] = pd.to_numeric(
+            fin['year'].astype(str).str.extract(r'(\d{4})')[0], errors='coerce'
+        )
+        fin['eps_original'] = to_number(fin['eps_original'])
+        fin = fin.dropna().sort_values('year').groupby('symbol').tail(1)
+        latest_eps = fin.set_index('symbol')['eps_original']
+        df['eps'] = df['TRADING_CODE'].map(latest_eps).fillna(df['eps'])
+    return df.drop_duplicates('TRADING_CODE', keep='last')
+
+
+class Screener(object):
+    """
+    Screens all symbols of a market at once.
+
+    The prices of every symbol are kept in one frame sorted by
+    TRADING_CODE and DATE, and the indicators are computed for all
+    symbols together with grouped rolling/ewm operations. `screen()`
+    evaluates `DataFrame.query` expressions on the latest row of every
+    symbol, joined with the fundamentals, like-
+    `screener.screen('rsi < 30', 'vol_ratio > 2', 'pe < pe_sector_median')`
+    """
+
+    def __init__(
+        self,
+        prices,
+        company_data=None,
+        financial_data=None,
+        rsi_period=14,
+        bb_period=20,
+        bb_std=2.0,
+        macd_fast=12,
+        macd_slow=26,
+        macd_smooth=9,
+        volume_period=20,
+    ):
+        self.rsi_period = rsi_period
+        self.bb_period = bb_period
+        self.bb_std = bb_std
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_smooth = macd_smooth
+        self.volume_period = volume_period
+
+        if 'TRADING_CODE' in (prices.index.names or []):
+            prices = prices.reset_index()
+        prices = to_typed_price_frame(prices[['TRADING_CODE', 'DATE'] + PRICE_COLUMNS])
+        self.data = prices.sort_values(
+            ['TRADING_CODE', 'DATE'], kind='stable'
+        ).reset_index(drop=True)
+        self.fundamentals = None
+        if company_data is not None:
+            self.fundamentals = fundamentals_frame(company_data, financial_data)
+        self.add_indicators()
+
+    @classmethod
+    def from_store(
+        cls,
+        store,
+        market='DSE',
+        symbols=None,
+        start_date=None,
+        end_date=None,
+        **kwargs
+    ):
+        prices = store.read(
+            market=market,
+            symbols=symbols,
+            start_date=start_date,
+            end_date=end_date,
+            columns=PRICE_COLUMNS
+        )
+        return cls(prices, **kwargs)
+
+    @classmethod
+    def from_files(cls, file_paths, format=None, **kwargs):
+        frames = []
+        for file_path in file_paths:
+            storage = get_storage(format or infer_format(file_path), history=True)
+            frames.append(storage.read(file_path))
+        return cls(pd.concat(frames, ignore_index=True), **kwargs)
+
+    def group(self, values):
+        return values.groupby(self.data['TRADING_CODE'], sort=False)
+
+    @staticmethod
+    def ungroup(values):
+        # grouped rolling/ewm results are indexed on (TRADING_CODE, row)
+        return values.reset_index(level=0, drop=True)
+
+    def wilder_mean(self, values, period):
+        # same as indicators.wilder_mean for every symbol: the average of
+        # the first `period` values seeds the smoothing at row `period`
+        position = self.group(values).cumcount()
+        seed = self.ungroup(self.group(values).rolling(period).mean())
+        seeded = values.where(position > period).mask(position == period, seed)
+        return self.ungroup(
+            self.group(seeded).ewm(alpha=1.0 / period, adjust=False).mean()
+        )
+
+    def add_indicators(self):
+        df = self.data
+        close = df['CLOSEP']
+
+        change = self.group(close).diff()
+        avg_gain = self.wilder_mean(change.clip(lower=0), self.rsi_period)
+        avg_loss = self.wilder_mean((-change).clip(lower=0), self.rsi_period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['rsi'] = (100 - 100 / (1 + avg_gain / avg_loss)).mask(avg_loss == 0, 100.0)
+
+        rolling = self.group(close).rolling(self.bb_period)
+        bb_middle = self.ungroup(rolling.mean())
+        deviation = self.ungroup(rolling.std(ddof=0)) * self.bb_std
+        df['bb_upper'] = bb_middle + deviation
+        df['bb_middle'] = bb_middle
+        df['bb_lower'] = bb_middle - deviation
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['bb_pos'] = (close - df['bb_lower']) / (2 * deviation)
+
+        fast_ema = self.ungroup(
+            self.group(close).ewm(span=self.macd_fast, min_periods=self.macd_slow).mean()
+        )
+        slow_ema = self.ungroup(
+            self.group(close).ewm(span=self.macd_slow, min_periods=self.macd_slow).mean()
+        )
+        df['macd'] = fast_ema - slow_ema
+        df['macd_sig'] = self.ungroup(
+            self.group(df['macd']).ewm(
+                span=self.macd_smooth, min_periods=self.macd_smooth
+            ).mean()
+        )
+        df['macd_hist'] = df['macd'] - df['macd_sig']
+
+        # average volume of the previous `volume_period` days
+        vol_avg = self.ungroup(
+            self.group(df['VOLUME'].astype('float64')).rolling(self.volume_period).mean()
+        )
+        df['vol_avg'] = self.group(vol_avg).shift(1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['vol_ratio'] = df['VOLUME'] / df['vol_avg']
+        df['change_pct'] = self.group(close).pct_change() * 100
+
+    def latest(self, date=None):
+        """
+        The last row of every symbol up to `date` (the last stored date
+        when None), with the fundamentals and pe columns when the
+        screener has company data.
+        """
+        df = self.data
+        if date is not None:
+            df = df[df['DATE'] <= pd.Timestamp(date)]
+        df = df.groupby('TRADING_CODE', sort=False).tail(1)
+        if self.fundamentals is not None:
+            df = df.merge(self.fundamentals, on='TRADING_CODE', how='left')
+            with np.errstate(divide='ignore', invalid='ignore'):
+                df['pe'] = (df['CLOSEP'] / df['eps']).where(df['eps'] > 0)
+            df['pe_sector_median'] = df.groupby('sector')['pe'].transform('median')
+        return df.reset_index(drop=True)
+
+    def screen(self, *conditions, date=None):
+        """
+        Symbols whose latest row matches all `conditions`, given as
+        `DataFrame.query` expressions on the columns of `latest()`.
+        """
+        df = self.latest(date=date)
+        if conditions:
+            df = df.query(' and '.join(f'({c})' for c in conditions))
+        return df.reset_index(drop=True)
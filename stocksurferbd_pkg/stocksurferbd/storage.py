@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+
+PRICE_FLOAT_COLUMNS = (
+    'LTP', 'HIGH', 'LOW', 'OPEN', 'OPENP', 'CLOSEP', 'YCP', '% CHANGE',
+    'VALUE_MN',
+)
+PRICE_INT_COLUMNS = ('TRADE', 'VOLUME')
+
+# one fixed-width record per trading day in the column order of the
+# history files, 80 bytes each
+OHLCV_DTYPE = np.dtype([
+    ('DATE', 'M8[ns]'),
+    ('LTP', 'f8'),
+    ('HIGH', 'f8'),
+    ('LOW', 'f8'),
+    ('OPENP', 'f8'),
+    ('CLOSEP', 'f8'),
+    ('YCP', 'f8'),
+    ('TRADE', 'i8'),
+    ('VALUE_MN', 'f8'),
+    ('VOLUME', 'i8'),
+])
+OHLCV_MAGIC = b'SSBDOHLC'
+OHLCV_SYMBOL_SIZE = 24
+OHLCV_HEADER_SIZE = len(OHLCV_MAGIC) + OHLCV_SYMBOL_SIZE
+
+
+def to_typed_price_frame(df):
+    """
+    Cast price columns to DATE -> datetime64, prices -> float64 and
+    TRADE/VOLUME -> int64.
+    """
+    df = df.copy()
+    if 'DATE' in df.columns:
+        df['DATE'] = pd.to_datetime(df['DATE'])
+    if 'TRADING_CODE' in df.columns:
+        df['TRADING_CODE'] = df['TRADING_CODE'].astype(str)
+    for col in PRICE_FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    for col in PRICE_INT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(
+                df[col], errors='coerce'
+            ).fillna(0).round().astype('int64')
+    return df
+
+
+def to_columnar_frame(df):
+    # Arrow needs one type per column: date cells become datetime64 and
+    # other mixed object columns (e.g. numbers mixed with '-') become str
+    df = df.reset_index(drop=True)
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        values = df[col].dropna()
+        if values.map(lambda x: isinstance(x, datetime.date)).any():
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+        elif not values.map(lambda x: isinstance(x, str)).all():
+            df[col] = df[col].astype(str)
+    return df
+
+
+def to_ohlcv_records(df):
+    """
+    Price rows as OHLCV_DTYPE records sorted by DATE. Missing price
+    columns are NaN and missing TRADE/VOLUME are 0.
+    """
+    df = to_typed_price_frame(df).sort_values('DATE', kind='stable')
+    records = np.zeros(len(df), dtype=OHLCV_DTYPE)
+    for name in OHLCV_DTYPE.names:
+        if name in df.columns:
+            records[name] = df[name].to_numpy()
+        elif name not in PRICE_INT_COLUMNS:
+            records[name] = np.nan
+    return records
+
+
+def get_ohlcv_header(symbol):
+    symbol_bytes = str(symbol).encode('utf-8')
+    if len(symbol_bytes) > OHLCV_SYMBOL_SIZE:
+        raise ValueError(f'Symbol is too long for an OHLCV file: {symbol}')
+    return OHLCV_MAGIC + symbol_bytes.ljust(OHLCV_SYMBOL_SIZE, b'\0')
+
+
+def write_ohlcv(path, symbol, records):
+    # a memmap of `path` must be released first, Windows can't replace
+    # a mapped file
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as ohlcv_file:
+        ohlcv_file.write(get_ohlcv_header(symbol))
+        ohlcv_file.write(records.tobytes())
+    os.replace(tmp_path, path)
+
+
+def append_ohlcv(path, records, n_rows):
+    # a record left half written by an interrupted append is cut off first.
+    # A memmap of `path` must be released first, Windows can't resize a
+    # mapped file
+    with open(path, 'r+b') as ohlcv_file:
+        ohlcv_file.truncate(OHLCV_HEADER_SIZE + n_rows * OHLCV_DTYPE.itemsize)
+        ohlcv_file.seek(0, os.SEEK_END)
+        ohlcv_file.write(records.tobytes())
+
+
+def open_ohlcv(path):
+    """
+    Symbol and records of an OHLCV file. The records are a read-only
+    numpy.memmap of the file, so slicing them copies nothing. The file
+    stays mapped while the records or a view of them are referenced.
+    """
+    with open(path, 'rb') as ohlcv_file:
+        header = ohlcv_file.read(OHLCV_HEADER_SIZE)
+    if len(header) < OHLCV_HEADER_SIZE or not header.startswith(OHLCV_MAGIC):
+        raise IOError(f'Not an OHLCV file: {path}')
+    symbol = header[len(OHLCV_MAGIC):].rstrip(b'\0').decode('utf-8')
+    n_rows = (os.path.getsize(path) - OHLCV_HEADER_SIZE) // OHLCV_DTYPE.itemsize
+    if not n_rows:
+        return symbol, np.zeros(0, dtype=OHLCV_DTYPE)
+    return symbol, np.memmap(
+        path, dtype=OHLCV_DTYPE, mode='r', offset=OHLCV_HEADER_SIZE, shape=(n_rows,)
+    )
+
+
+class ExcelStorage(object):
+    extension = '.xlsx'
+    columnar = False
+
+    def write(self, df, path, index=False):
+        df.to_excel(path, index=index)
+
+    def read(self, path):
+        df = pd.read_excel(path)
+        return df.drop(columns=['Unnamed: 0'], errors='ignore')
+
+
+class CsvStorage(object):
+    extension = '.csv'
+    columnar = False
+
+    def write(self, df, path, index=False):
+        df.to_csv(path, index=index)
+
+    def read(self, path):
+        df = pd.read_csv(path)
+        return df.drop(columns=['Unnamed: 0'], errors='ignore')
+
+
+class ParquetStorage(object):
+    extension = '.parquet'
+    columnar = True
+
+    def write(self, df, path, index=False):
+        to_columnar_frame(df).to_parquet(path, index=False)
+
+    def read(self, path):
+        return pd.read_parquet(path)
+
+
+class FeatherStorage(object):
+    extension = '.feather'
+    columnar = True
+
+    def write(self, df, path, index=False):
+        to_columnar_frame(df).to_feather(path)
+
+    def read(self, path):
+        return pd.read_feather(path)
+
+
+class OhlcvStorage(object):
+    """Fixed-width binary file of one symbol, see PriceArchive."""
+    extension = '.ohlcv'
+    columnar = True
+
+    def write(self, df, path, index=False):
+        symbols = pd.unique(df['TRADING_CODE'].astype(str))
+        if len(symbols) > 1:
+            raise ValueError('An OHLCV file holds the rows of one symbol')
+        symbol = symbols[0] if len(symbols) else ''
+        write_ohlcv(path, symbol, to_ohlcv_records(df))
+
+    def read(self, path):
+        symbol, records = open_ohlcv(path)
+        df = pd.DataFrame({name: records[name] for name in OHLCV_DTYPE.names})
+        df.insert(1, 'TRADING_CODE', symbol)
+        return df
+
+
+STORAGE_FORMATS = {
+    'excel': ExcelStorage,
+    'csv': CsvStorage,
+    'parquet': ParquetStorage,
+    'feather': FeatherStorage,
+}
+# formats of the price history of one symbol
+HISTORY_FORMATS = dict(STORAGE_FORMATS, ohlcv=OhlcvStorage)
+
+
+def get_storage(format='excel', history=False):
+    formats = HISTORY_FORMATS if history else STORAGE_FORMATS
+    if format not in formats:
+        if format in HISTORY_FORMATS:
+            raise ValueError(
+                f'The {format} format only holds the price history of one '
+                'symbol! Possible values are- ' + ', '.join(formats)
+            )
+        raise ValueError(
+            'Invalid file format! Possible values are- '
+            + ', '.join(formats)
+        )
+    return formats[format]()
+
+
+def infer_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    for format, storage_class in HISTORY_FORMATS.items():
+        if extension == storage_class.extension:
+            return format
+    return 'excel'
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import os
+import sys
+
+import pytest
+
+# the tests import the package and the saved pages from the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.fixtures import FixtureClient, is_recorded, read_recorded  # noqa: E402
+
+
+def pytest_report_header(config):
+    if is_recorded():
+        return 'fixture pages: recorded from the live DSE/CSE sites'
+    return (
+        'fixture pages: SYNTHETIC, parity tests only cover hand-written markup '
+        '(record real pages with- python -m benchmarks.fixtures ACI)'
+    )
+
+
+@pytest.fixture(scope='session')
+def fixture_client():
+    return FixtureClient()
+
+
+@pytest.fixture(scope='session')
+def read_page():
+    return read_recorded
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# The regex parser of the CSE 6 month graph page against the split based
+# parser it replaced. cse_graph.html is synthetic and was shaped so the
+# split parser accepts it (see benchmarks/fixtures.py), the live page may
+# differ.
+
+import pandas as pd
+import pytest
+
+from stocksurferbd_pkg import PriceData
+
+
+def parse_cse_graph_split(resp_text, symbol):
+    # the parser before the regex, kept to compare the rows
+    split1 = resp_text.split("volumeData.push([date, round(volume)]);")[1]
+    split2 = split1.split("$(document).ready(function () {")[0]
+    lines = split2.replace(
+        "date = new Date(", ""
+    ).replace(
+        "ohlcData.push([date, ", ""
+    ).replace(
+        "volumeData.push([date, ", ""
+    ).replace(
+        "]);", ""
+    ).replace(
+        ");", ""
+    ).replace(
+        "\n\n\n", "\n"
+    ).replace(
+        "\n\n", "\n"
+    ).replace(
+        " ", ""
+    ).lstrip().rstrip()
+
+    dict_list = []
+    for rec in lines.split("\n\n"):
+        items = rec.split("\n")
+        date_comps = items[0].split(",")
+        date_comps[1] = f'{int(date_comps[1]) + 1:02d}'
+        high, low, open_p, close_p = (float(x) for x in items[1].split(','))
+        dict_list.append({
+            'DATE': "-".join(date_comps),
+            'TRADING_CODE': symbol,
+            'LTP': 0,
+            'OPENP': open_p,
+            'HIGH': high,
+            'LOW': low,
+            'CLOSEP': close_p,
+            'YCP': 0,
+            '% CHANGE': 0,
+            'TRADE': 0,
+            'VALUE_MN': 0,
+            'VOLUME': int(items[2]),
+        })
+    return dict_list
+
+
+def graph_page(records):
+    return (
+        '<script>\n'
+        '            volumeData.push([date, round(volume)]);\n'
+        + records
+        + '\n$(document).ready(function () { chart(); });\n</script>'
+    )
+
+
+EXPECTED_ROWS = [
+    {
+        'DATE': '2024-05-2', 'TRADING_CODE': 'ACI', 'LTP': 0, 'OPENP': 212.0,
+        'HIGH': 215.9, 'LOW': 210.1, 'CLOSEP': 214.3, 'YCP': 0, '% CHANGE': 0,
+        'TRADE': 0, 'VALUE_MN': 0, 'VOLUME': 12345,
+    },
+    {
+        'DATE': '2024-05-12', 'TRADING_CODE': 'ACI', 'LTP': 0, 'OPENP': 214.0,
+        'HIGH': 216.0, 'LOW': 213.5, 'CLOSEP': 215.2, 'YCP': 0, '% CHANGE': 0,
+        'TRADE': 0, 'VALUE_MN': 0, 'VOLUME': 1200,
+    },
+]
+
+
+def test_saved_page_matches_split_parser(read_page):
+    page = read_page('cse_graph.html')
+    rows = PriceData.parse_cse_graph(page, 'ACI')
+    assert len(rows) == 120
+    assert rows == parse_cse_graph_split(page.replace('\r\n', '\n'), 'ACI')
+
+
+def test_saved_page_frame_matches_list(read_page):
+    page = read_page('cse_graph.html')
+    df = PriceData.parse_cse_graph(page, 'ACI', output='frame')
+    pd.testing.assert_frame_equal(
+        df, pd.DataFrame(PriceData.parse_cse_graph(page, 'ACI'))
+    )
+
+
+@pytest.mark.parametrize('records', [
+    # layout of the live page
+    '            \n            date = new Date(2024,4,2);\n'
+    '            ohlcData.push([date, 215.9, 210.1, 212, 214.3]);\n'
+    '            volumeData.push([date, 12345]);\n'
+    '            \n            date = new Date(2024,4,12);\n'
+    '            ohlcData.push([date, 216, 213.5, 214, 215.2]);\n'
+    '            volumeData.push([date, 1200.0]);\n',
+    # no spaces
+    'date=new Date(2024,4,2);ohlcData.push([date,215.9,210.1,212,214.3]);'
+    'volumeData.push([date,12345]);'
+    'date=new Date(2024,4,12);ohlcData.push([date,216,213.5,214,215.2]);'
+    'volumeData.push([date,1200.0]);',
+    # extra spaces, tabs and CRLF
+    '\r\n\t\tvar date = new Date( 2024 , 4 , 2 );\r\n'
+    '\t\tohlcData.push([ date , 215.9 , 210.1 , 212 , 214.3 ]);\r\n'
+    '\t\tvolumeData.push([ date , 12345 ]);\r\n\r\n'
+    '\t\tdate = new Date(\t2024,\t4,\t12\t);\r\n'
+    '\t\tohlcData.push([date,\r\n 216,\r\n 213.5,\r\n 214,\r\n 215.2]);\r\n'
+    '\t\tvolumeData.push([date,   1200.0   ]);\r\n',
+])
+def test_whitespace_variants(records):
+    page = graph_page(records)
+    rows = PriceData.parse_cse_graph(page, 'ACI')
+    # the day is not zero padded and the volume is int(float(volume)),
+    # like the rows saved by the split parser
+    assert rows == EXPECTED_ROWS
+    pd.testing.assert_frame_equal(
+        PriceData.parse_cse_graph(page, 'ACI', output='frame'),
+        pd.DataFrame(EXPECTED_ROWS),
+    )
+
+
+def test_split_parser_day_and_volume():
+    page = graph_page(
+        '            \n            date = new Date(2024,4,2);\n'
+        '            ohlcData.push([date, 215.9, 210.1, 212, 214.3]);\n'
+        '            volumeData.push([date, 12345]);\n'
+    )
+    assert parse_cse_graph_split(page, 'ACI') == EXPECTED_ROWS[:1]
+    assert PriceData.parse_cse_graph(page, 'ACI') == EXPECTED_ROWS[:1]
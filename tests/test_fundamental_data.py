@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# FundamentalData reports downloads and parse errors through its metrics
+# instead of printing them.
+
+from stocksurferbd_pkg import FundamentalData, MetricsCollector
+
+
+def test_company_download_is_counted(fixture_client, capsys):
+    metrics = MetricsCollector()
+    loader = FundamentalData(metrics=metrics)
+    loader.client = fixture_client
+    df_company, _ = loader.get_company_df('ACI')
+    assert len(df_company) == 1
+    assert metrics.counters['companies_downloaded'] == 1
+    assert metrics.failures == []
+    assert capsys.readouterr().out == ''
+
+
+def test_bad_agm_date_is_recorded(read_page, capsys):
+    metrics = MetricsCollector()
+    loader = FundamentalData(metrics=metrics)
+    page = read_page('dse_company.html').replace('12-12-2023', 'not held')
+    df_company, _ = loader.parse_company_page(page, 'ACI')
+    assert df_company['last_agm_date'].tolist() == ['None']
+    assert metrics.counters['agm_date_errors'] == 1
+    assert [failure['symbol'] for failure in metrics.failures] == ['ACI']
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# Both HTML backends must give the same rows from the saved DSE/CSE pages.
+# Until they are replaced by real captures the pages are synthetic (see
+# benchmarks/fixtures.py), so this only covers their hand-written markup.
+
+import pandas as pd
+import pytest
+
+from stocksurferbd_pkg import FundamentalData, PriceData
+from stocksurferbd_pkg.stocksurferbd.html_backends import BS4Backend, LxmlBackend
+
+
+@pytest.fixture(scope='module')
+def backends():
+    pytest.importorskip('lxml')
+    return BS4Backend(), LxmlBackend()
+
+
+@pytest.fixture(scope='module')
+def loaders(fixture_client, backends):
+    return [PriceData(client=fixture_client, html_backend=b) for b in backends]
+
+
+def parse_with(loader, page, method, **kwargs):
+    return getattr(loader, method)(loader.html_backend.load(page), **kwargs)
+
+
+def test_price_history_dse(loaders):
+    bs4_rows, lxml_rows = [loader.parse_price_history_dse('ACI') for loader in loaders]
+    assert len(bs4_rows) == 250
+    assert bs4_rows == lxml_rows
+
+
+def test_price_history_dse_frame(loaders):
+    bs4_df, lxml_df = [
+        loader.parse_price_history_dse('ACI', output='frame') for loader in loaders
+    ]
+    pd.testing.assert_frame_equal(bs4_df, lxml_df)
+
+
+@pytest.mark.parametrize('method, page', [
+    ('parse_current_prices_dse', 'dse_latest.html'),
+    ('parse_current_prices_cse', 'cse_current.html'),
+])
+def test_current_prices(loaders, read_page, method, page):
+    bs4_rows, lxml_rows = [
+        parse_with(loader, read_page(page), method) for loader in loaders
+    ]
+    assert len(bs4_rows) > 300
+    assert bs4_rows == lxml_rows
+
+    bs4_df, lxml_df = [
+        parse_with(loader, read_page(page), method, output='frame') for loader in loaders
+    ]
+    pd.testing.assert_frame_equal(bs4_df, lxml_df)
+
+
+def test_floor_prices_dse(loaders, read_page):
+    bs4_prices, lxml_prices = [
+        parse_with(loader, read_page('dse_cbul.html'), 'parse_floor_prices_dse')
+        for loader in loaders
+    ]
+    assert len(bs4_prices) == 400
+    assert bs4_prices == lxml_prices
+
+
+def test_company_data_rows(backends, read_page):
+    page = read_page('dse_company.html')
+    bs4_rows, lxml_rows = [
+        FundamentalData.parse_company_data_rows(
+            backend.load(page), 'ACI', html_backend=backend
+        )
+        for backend in backends
+    ]
+    assert bs4_rows[0]['company_info']['market_cap'] == '20,132.6'
+    assert bs4_rows == lxml_rows
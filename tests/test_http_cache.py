@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import pytest
+
+from stocksurferbd_pkg import HttpClient, PriceData, ResponseCache
+from stocksurferbd_pkg.stocksurferbd.http_cache import CacheMissError
+
+
+def test_user_ttls_are_matched_first(tmp_path):
+    cache = ResponseCache(
+        cache_dir=str(tmp_path),
+        ttls={'latest_share_price_scroll_l.php': 5, 'cbul.php': 10},
+    )
+    assert cache.get_ttl(PriceData.CURRENT_PRICE_URL_DSE) == 5
+    assert cache.get_ttl('https://www.dsebd.org/cbul.php') == 10
+    assert cache.get_ttl('https://www.dsebd.org/displayCompany.php?name=ACI') == 24 * 3600
+
+
+def test_offline_replay_of_history_on_a_later_day(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    loader = PriceData()
+    cache.store(loader.get_history_url_dse('ACI', end_date='2024-05-02'), 'page of may 2')
+
+    replay = ResponseCache(cache_dir=str(tmp_path), offline=True)
+    client = HttpClient(cache=replay)
+    later_url = loader.get_history_url_dse('ACI', end_date='2024-05-05')
+    assert client.get_text(later_url) == 'page of may 2'
+    with pytest.raises(CacheMissError):
+        client.get_text(loader.get_history_url_dse('GP', end_date='2024-05-05'))
+    # online the exact URL is needed
+    assert cache.load(later_url) is None
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# AsyncHttpClient is bound to one event loop at a time, and a loader's
+# own async client follows it from one asyncio.run() to the next.
+
+import asyncio
+import http.server
+import threading
+
+import pytest
+
+pytest.importorskip('httpx')
+
+from stocksurferbd_pkg import AsyncHttpClient, FundamentalData  # noqa: E402
+
+
+class PageHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        page = self.server.page
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    server.page = b'ok'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def page_url(server):
+    return f'http://127.0.0.1:{server.server_address[1]}/'
+
+
+def test_client_of_an_ended_loop_moves_to_a_new_loop(page_url):
+    client = AsyncHttpClient()
+    assert asyncio.run(client.get_text(page_url)) == 'ok'
+    assert asyncio.run(client.get_text(page_url)) == 'ok'
+    # closing on another loop drops the session of the ended one
+    asyncio.run(client.aclose())
+    assert client.session is None
+
+
+def test_open_client_refuses_a_running_loop(page_url):
+    client = AsyncHttpClient()
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(client.get_text(page_url)) == 'ok'
+        with pytest.raises(RuntimeError):
+            asyncio.run(client.get_text(page_url))
+        loop.run_until_complete(client.aclose())
+    finally:
+        loop.close()
+    assert asyncio.run(client.get_text(page_url)) == 'ok'
+
+
+def test_closed_client_moves_to_a_new_loop(page_url):
+    client = AsyncHttpClient()
+
+    async def fetch():
+        try:
+            return await client.get_text(page_url)
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(fetch()) == 'ok'
+    assert asyncio.run(fetch()) == 'ok'
+    assert client.session is None
+
+
+def test_loader_client_over_many_runs(server, page_url, read_page):
+    server.page = read_page('dse_company.html').encode('utf-8')
+    loader = FundamentalData()
+    loader.DSE_COMPANY_URL = page_url + '?name='
+    for _ in range(2):
+        df_company, _ = asyncio.run(loader.afetch_company('ACI'))
+        assert len(df_company) == 1
+    client = loader.async_client
+    asyncio.run(loader.aclose())
+    assert client.session is None
+    # the loader made the client, so it is dropped
+    assert loader.async_client is None
+    df_company, _ = asyncio.run(loader.afetch_company('ACI'))
+    assert loader.async_client is not client
+    asyncio.run(loader.aclose())
+
+
+def test_loader_keeps_a_given_client(page_url):
+    client = AsyncHttpClient()
+    loader = FundamentalData(async_client=client)
+    asyncio.run(loader.aclose())
+    loader.reset_async_client()
+    assert loader.async_client is client
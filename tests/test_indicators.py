@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# The indicators against the outputs of the libraries they replaced, on a
+# fixed series with flat stretches. The reference values were made with
+# pyti 0.3.0 (Bollinger bands, RSI), tapy 1.11.0 (fractals) and the
+# pandas MACD that was in price_plots.py, for period 5 and MACD (3, 6, 3).
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stocksurferbd_pkg.stocksurferbd import indicators
+
+NAN = np.nan
+CLOSE = pd.Series([
+    10.0, 10.4, 10.2, 10.9, 11.3, 11.3, 11.3, 10.8, 10.5, 10.9,
+    11.6, 12.1, 11.8, 11.2, 11.2, 11.5, 12.4, 12.9, 12.6, 12.0,
+    11.4, 11.1, 11.6, 12.2, 12.8, 13.1, 12.7, 12.7, 13.4, 13.9,
+])
+HIGH = CLOSE + 0.3
+LOW = CLOSE - 0.2
+PERIOD = 5
+
+BB_UPPER = [
+    NAN, NAN, NAN, NAN, 11.5116301803, 11.7268627239, 11.8579044236,
+    11.565421149, 11.704529909, 11.5744916598, 11.7935631842, 12.3489311357,
+    12.5625396399, 12.3722910301, 12.277423831, 12.2597142274, 12.5179977728,
+    13.2175340286, 13.4308775687, 13.2548846086, 13.3, 13.3682105101, 12.78,
+    12.4559899497, 13.0358947323, 13.638377489, 13.5337551898, 13.2796550698,
+    13.4855272679, 14.0686253353,
+]
+BB_MIDDLE = [
+    NAN, NAN, NAN, NAN, 10.56, 10.82, 11.0, 11.12, 11.04, 10.96, 11.02,
+    11.18, 11.38, 11.52, 11.58, 11.56, 11.62, 11.84, 12.12, 12.28, 12.26,
+    12.0, 11.74, 11.66, 11.82, 12.16, 12.48, 12.7, 12.94, 13.16,
+]
+BB_LOWER = [
+    NAN, NAN, NAN, NAN, 9.6083698197, 9.9131372761, 10.1420955764,
+    10.674578851, 10.375470091, 10.3455083402, 10.2464368158, 10.0110688643,
+    10.1974603601, 10.6677089699, 10.882576169, 10.8602857726, 10.7220022272,
+    10.4624659714, 10.8091224313, 11.3051153914, 11.22, 10.6317894899, 10.7,
+    10.8640100503, 10.6041052677, 10.681622511, 11.4262448102, 12.1203449302,
+    12.3944727321, 12.2513746647,
+]
+RSI = [
+    NAN, NAN, NAN, NAN, NAN, 88.2352941176, 88.2352941176, 60.4534005038,
+    48.9047376465, 61.2442040185, 74.6408988196, 80.6216925227, 68.5044212433,
+    49.7944265724, 49.7944265724, 58.6232271594, 75.0659530412, 80.4586816952,
+    69.229051822, 51.3216325695, 38.7819995216, 33.6442263341, 47.9968978483,
+    60.7360223295, 69.9405478141, 73.7819325335, 60.8265884598, 60.8265884598,
+    73.5337669936, 79.4776134015,
+]
+MACD = [
+    NAN, NAN, NAN, NAN, NAN, 0.1863004223, 0.1594703457, 0.0293255301,
+    -0.0812623795, -0.0271520965, 0.1411271094, 0.2856093224, 0.233127333,
+    0.0540338077, -0.0176344025, 0.0231866003, 0.2264653326, 0.3735107442,
+    0.3085174, 0.1128622886, -0.1015620585, -0.2278648879, -0.1333387979,
+    0.0479871244, 0.2344239219, 0.3317908311, 0.2334642456, 0.164995469,
+    0.2669599306, 0.3723754858,
+]
+MACD_SIG = [
+    NAN, NAN, NAN, NAN, NAN, NAN, NAN, 0.0889347477, -0.0018370535,
+    -0.0149028821, 0.0643504469, 0.1758509826, 0.2046014644, 0.1291703096,
+    0.0556962015, 0.0394334601, 0.132972233, 0.2532561717, 0.2808884724,
+    0.1968728166, 0.0476531021, -0.0901069439, -0.1117229533, -0.0318677622,
+    0.1012782069, 0.216534574, 0.2249994118, 0.1949974368, 0.2309786858,
+    0.3016770879,
+]
+FRACTAL_HIGHS = [11, 17, 25]
+FRACTAL_LOWS = [8, 21]
+
+
+def assert_values(series, expected):
+    np.testing.assert_allclose(series.to_numpy(), expected, rtol=0, atol=1e-9)
+
+
+def test_bollinger_bands():
+    upper, middle, lower = indicators.bollinger_bands(CLOSE, PERIOD)
+    assert_values(upper, BB_UPPER)
+    assert_values(middle, BB_MIDDLE)
+    assert_values(lower, BB_LOWER)
+
+
+def test_rsi():
+    assert_values(indicators.rsi(CLOSE, PERIOD), RSI)
+
+
+def test_rsi_without_losses():
+    rising = pd.Series(np.arange(10, dtype=float))
+    assert (indicators.rsi(rising, PERIOD)[PERIOD:] == 100.0).all()
+
+
+def test_macd():
+    macd_line, macd_sig, macd_hist = indicators.macd(CLOSE, 3, 6, 3)
+    assert_values(macd_line, MACD)
+    assert_values(macd_sig, MACD_SIG)
+    assert_values(macd_hist, np.subtract(MACD, MACD_SIG))
+
+
+def test_fractals():
+    fractal_high, fractal_low = indicators.fractals(HIGH, LOW)
+    assert np.flatnonzero(fractal_high).tolist() == FRACTAL_HIGHS
+    assert np.flatnonzero(fractal_low).tolist() == FRACTAL_LOWS
+
+
+# The streaming classes against the vectorized indicators, updated from
+# the first bar and seeded with part of the history.
+
+def random_walk(n=600, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    # flat stretches like the days without trades
+    close[100:110] = close[99]
+    close[400:404] = close[399]
+    close = pd.Series(np.round(close, 1))
+    return close, close * 1.01 + 0.2, close * 0.99 - 0.1
+
+
+SEED_BARS = [0, 37, 250]
+
+
+@pytest.mark.parametrize('seed_bars', SEED_BARS)
+def test_streaming_macd(seed_bars):
+    close, _, _ = random_walk()
+    expected = np.column_stack(indicators.macd(close, 10, 22, 7))
+    streaming = indicators.StreamingMACD(10, 22, 7).seed(close[:seed_bars])
+    values = np.array([streaming.update(c) for c in close[seed_bars:]])
+    np.testing.assert_allclose(values, expected[seed_bars:], rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('seed_bars', SEED_BARS)
+def test_streaming_rsi(seed_bars):
+    close, _, _ = random_walk()
+    expected = indicators.rsi(close, 10).to_numpy()
+    streaming = indicators.StreamingRSI(10).seed(close[:seed_bars])
+    values = [streaming.update(c) for c in close[seed_bars:]]
+    np.testing.assert_allclose(values, expected[seed_bars:], rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('seed_bars', SEED_BARS)
+def test_streaming_bollinger(seed_bars):
+    close, _, _ = random_walk()
+    expected = np.column_stack(indicators.bollinger_bands(close, 10))
+    streaming = indicators.StreamingBollinger(10).seed(close[:seed_bars])
+    values = np.array([streaming.update(c) for c in close[seed_bars:]])
+    np.testing.assert_allclose(values, expected[seed_bars:], rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('seed_bars', SEED_BARS)
+def test_streaming_fractals(seed_bars):
+    _, high, low = random_walk()
+    fractal_high, fractal_low = indicators.fractals(high, low)
+    streaming = indicators.StreamingFractals().seed(high[:seed_bars], low[:seed_bars])
+    values = [streaming.update(h, lo) for h, lo in zip(high[seed_bars:], low[seed_bars:])]
+    # every update gives the fractals of the bar two bars back
+    start = max(seed_bars, 4)
+    assert values[start - seed_bars:] == list(zip(
+        fractal_high[start - 2:-2], fractal_low[start - 2:-2]
+    ))
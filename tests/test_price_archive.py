@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# PriceArchive releases its map of a file before writing it, Windows can't
+# resize or replace a mapped file.
+
+import gc
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.fixtures import make_ohlcv
+from stocksurferbd_pkg import PriceArchive
+from stocksurferbd_pkg.stocksurferbd import price_archive
+
+
+def count_maps(path):
+    gc.collect()
+    return sum(
+        1 for obj in gc.get_objects()
+        if isinstance(obj, np.memmap) and obj._mmap is not None
+        and obj.filename == os.path.abspath(path)
+    )
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    for name in ('append_ohlcv', 'write_ohlcv'):
+        write = getattr(price_archive, name)
+
+        def checked_write(path, *args, write=write):
+            assert count_maps(path) == 0
+            return write(path, *args)
+
+        monkeypatch.setattr(price_archive, name, checked_write)
+    return PriceArchive(str(tmp_path))
+
+
+def test_writes_release_the_map(archive):
+    df = make_ohlcv(years=1)
+    archive.write(df[:200])
+    # rows after the last date are appended, the others merged
+    archive.write(df[200:])
+    archive.write(df[100:150])
+
+    records = archive.get_records('SYM000')
+    assert len(records) == len(df)
+    np.testing.assert_array_equal(records['CLOSEP'], df['CLOSEP'].to_numpy())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# The columnar frame parser against the row parser, with empty cells and
+# whitespace inside cells.
+
+import numpy as np
+import pandas as pd
+
+from stocksurferbd_pkg import PriceData
+from stocksurferbd_pkg.stocksurferbd.storage import to_typed_price_frame
+
+# DATE, TRADING_CODE, LTP, HIGH, LOW, OPENP, CLOSEP, YCP, TRADE, VALUE_MN, VOLUME
+ROWS = [
+    ['2024-05-02', 'ACI', '205.1', '210.8', '203.1', '205.1', '205.1', '208.7', '78', '1.454', '7,087'],
+    # no LTP, the row is skipped
+    ['2024-05-01', 'ACI', '', '211.0', '204.0', '206.0', '206.0', '207.0', '80', '1.5', '7,100'],
+    ['2024-04-30', 'A CI', '2 07.3', '211.0', '204.0', '206.0', '207.0', '--', '1,234', '1.5', ' 7 100 '],
+    ['2024-04-29', '', '--', '--', '--', '--', '--', '--', '0', '0', '0'],
+    ['2024-04-28', 'GP', '300', '301', '299', '300', '300', '300', '5', '0.5', ''],
+]
+
+
+def archive_page(rows):
+    cells = ''.join(
+        f'<tr><td>{i}</td>' + ''.join(f'<td>\n {cell} </td>' for cell in row) + '</tr>'
+        for i, row in enumerate(rows, 1)
+    )
+    return (
+        '<html><body>'
+        '<table class="table table-bordered background-white shares-table fixedHeader">'
+        f'<thead><tr><th>#</th></tr></thead><tbody>{cells}</tbody></table>'
+        '</body></html>'
+    )
+
+
+def test_frame_output_equals_list_output():
+    loader = PriceData()
+    page = archive_page(ROWS)
+    rows = loader.parse_history_page_dse(page, output='list')
+    assert [row['TRADING_CODE'] for row in rows] == ['ACI', 'ACI', '']
+    assert rows[1]['LTP'] == 207.3
+    assert rows[1]['VOLUME'] == 7100
+
+    df = loader.parse_history_page_dse(page, output='frame')
+    pd.testing.assert_frame_equal(df, to_typed_price_frame(pd.DataFrame(rows)))
+
+
+def test_columns_keep_cells_in_their_rows():
+    np.testing.assert_array_equal(
+        PriceData.parse_number_column(['1', '', '2 3', ' 1,200 ', '--']),
+        [1, np.nan, 23, 1200, 0]
+    )
+    assert PriceData.parse_text_column(['', 'A B', ' C ']).tolist() == ['', 'AB', 'C']
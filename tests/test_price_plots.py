@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# The indicator cache of CandlestickPlot must not change the plotted values.
+
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import make_ohlcv
+from stocksurferbd_pkg import CandlestickPlot, IndicatorCache
+
+
+@pytest.fixture
+def history_file(tmp_path):
+    path = str(tmp_path / 'SYM000.csv')
+    make_ohlcv(years=2).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('resample, step', [(False, '1D'), (True, 'W')])
+def test_cached_indicators_match_uncached(history_file, resample, step):
+    uncached = CandlestickPlot(history_file, 'SYM000', data_n=120)
+    uncached.load_data(resample=resample, step=step)
+
+    cache = IndicatorCache()
+    cached = CandlestickPlot(history_file, 'SYM000', data_n=120, indicator_cache=cache)
+    for _ in range(2):
+        cached.load_data(resample=resample, step=step)
+        pd.testing.assert_frame_equal(
+            cached.get_indicator_data()[-120:], uncached.get_indicator_data()[-120:]
+        )
+    assert len(cache.entries) == 1
+
+
+def test_indicators_cover_the_whole_history(history_file):
+    cd_plot = CandlestickPlot(history_file, 'SYM000', data_n=120)
+    cd_plot.load_data()
+    assert len(cd_plot.get_indicator_data()) == len(cd_plot.data)
+
+
+def test_render_many_reports_every_timeframe(tmp_path):
+    # 200 days are too short for 30 monthly bars
+    make_ohlcv(years=1)[-200:].to_csv(tmp_path / 'SYM000.csv', index=False)
+    results = CandlestickPlot.render_many(
+        ['SYM000', 'SYM001'],
+        timeframes=('1D', 'W', 'M'),
+        out_dir=str(tmp_path),
+        data_dir=str(tmp_path),
+        file_name='{symbol}.csv',
+        workers=1,
+        data_n=30,
+    )
+    result = results['SYM000']
+    assert result['status'] == 'error'
+    assert [step for step, chart in result['timeframes'].items()
+            if chart['status'] == 'ok'] == ['1D', 'W']
+    assert result['files'] == [
+        str(tmp_path / 'SYM000_1D.png'), str(tmp_path / 'SYM000_W.png')
+    ]
+    assert all((tmp_path / f'SYM000_{step}.png').exists() for step in ('1D', 'W'))
+    assert result['error'].startswith('M: ')
+    # a missing file fails every timeframe
+    assert results['SYM001']['files'] == []
+    assert len(results['SYM001']['timeframes']) == 3
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from benchmarks.fixtures import make_ohlcv  # noqa: E402
+from stocksurferbd_pkg import PriceBars, PriceStore  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(str(tmp_path))
+
+
+@pytest.fixture
+def history():
+    df_a = make_ohlcv(years=2, seed=1)
+    df_b = make_ohlcv(years=2, seed=2).assign(TRADING_CODE='SYM001')
+    return pd.concat([df_a, df_b], ignore_index=True)
+
+
+def test_write_read_round_trip(store, history):
+    assert store.write(history) == len(history)
+    df = store.read()
+    assert df.index.names == ['TRADING_CODE', 'DATE']
+    assert len(df) == len(history)
+    assert store.get_years() == sorted(history['DATE'].dt.year.unique())
+    assert store.get_symbols() == ['SYM000', 'SYM001']
+
+    df_a = store.read_symbol('SYM000', start_date='2024-01-01')
+    expected = history[
+        (history['TRADING_CODE'] == 'SYM000') & (history['DATE'] >= '2024-01-01')
+    ]
+    assert df_a['CLOSEP'].tolist() == pytest.approx(expected['CLOSEP'].tolist())
+
+
+def test_read_output_writes_back(store, history):
+    store.write(history)
+    df = store.read(symbols=['SYM001'])
+    assert store.write(df) == len(df)
+    pd.testing.assert_frame_equal(store.read(symbols=['SYM001']), df)
+    assert store.write(PriceBars.from_frame(df)) == len(df)
+    assert len(store.read()) == len(history)
+
+
+def test_upsert_replaces_rows(store, history):
+    store.write(history)
+    last_day = history[history['DATE'] == history['DATE'].max()].copy()
+    last_day['CLOSEP'] = 1.0
+    new_day = last_day.assign(DATE=last_day['DATE'] + pd.Timedelta(days=3))
+    store.write(pd.concat([last_day, new_day], ignore_index=True))
+
+    df = store.read()
+    assert len(df) == len(history) + len(new_day)
+    assert (store.read_date(history['DATE'].max())['CLOSEP'] == 1.0).all()
+    assert len(store.read_date(new_day['DATE'].iloc[0])) == 2
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# The bars cached by a Resampler against a fresh resample of the file.
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from benchmarks.fixtures import make_ohlcv  # noqa: E402
+from stocksurferbd_pkg import Resampler  # noqa: E402
+from stocksurferbd_pkg.stocksurferbd.resampler import to_ohlc_frame  # noqa: E402
+
+STEPS = ['3D', 'W', 'M']
+
+
+def save(df, path, mtime):
+    # every save is newer than the cache written before it
+    mtime = time.time() + mtime
+    df.to_csv(path, index=False)
+    os.utime(path, (mtime, mtime))
+
+
+def cached_bars(resampler, path, step):
+    return resampler.get_bars(
+        path, step, lambda: to_ohlc_frame(pd.read_csv(path))
+    )
+
+
+def assert_fresh(bars, path, step):
+    fresh = Resampler.resample(to_ohlc_frame(pd.read_csv(path)), step)
+    # bars read back from the cache have no index freq
+    pd.testing.assert_frame_equal(bars, fresh, check_freq=False)
+
+
+@pytest.mark.parametrize('step', STEPS)
+def test_cached_bars_after_append_and_rewrite(tmp_path, step):
+    path = str(tmp_path / 'SYM000.csv')
+    history = make_ohlcv(years=2)
+    resampler = Resampler()
+    updates = []
+    update = resampler.update
+    resampler.update = lambda *args: updates.append(args) or update(*args)
+
+    save(history[:300], path, 10)
+    assert_fresh(cached_bars(resampler, path, step), path, step)
+
+    # rows appended
+    save(history[:320], path, 20)
+    assert_fresh(cached_bars(resampler, path, step), path, step)
+    assert len(updates) == 1
+
+    # the file rewritten with a window shifted by one day
+    save(history[1:321], path, 30)
+    assert_fresh(cached_bars(resampler, path, step), path, step)
+
+    # a stored row changed
+    history.loc[200, 'CLOSEP'] *= 2
+    save(history[1:321], path, 40)
+    assert_fresh(cached_bars(resampler, path, step), path, step)
+    # only the append was an update
+    assert len(updates) == 1
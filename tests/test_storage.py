@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+# The ohlcv format is only accepted for the history of one symbol, the
+# other save paths reject it before downloading anything.
+
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import make_ohlcv
+from stocksurferbd_pkg import FundamentalData, PriceData
+from stocksurferbd_pkg.stocksurferbd.storage import STORAGE_FORMATS, infer_format
+
+
+def test_history_file_round_trip(tmp_path):
+    path = str(tmp_path / 'SYM000.ohlcv')
+    df = make_ohlcv(years=1)
+    PriceData.save_data(df, path, format='ohlcv')
+    assert infer_format(path) == 'ohlcv'
+    df_loaded = PriceData.load_data(path)
+    assert len(df_loaded) == len(df)
+    assert (df_loaded['TRADING_CODE'] == 'SYM000').all()
+    pd.testing.assert_series_equal(
+        df_loaded['CLOSEP'], df['CLOSEP'].astype(df_loaded['CLOSEP'].dtype)
+    )
+
+
+class UnusedClient(object):
+    def get_text(self, url):
+        raise AssertionError(f'Requested {url}')
+
+
+def test_other_paths_reject_ohlcv(tmp_path):
+    assert 'ohlcv' not in STORAGE_FORMATS
+    fund_loader = FundamentalData()
+    fund_loader.client = UnusedClient()
+    with pytest.raises(ValueError, match='price history of one symbol'):
+        fund_loader.save_company_data('ACI', path=str(tmp_path), format='ohlcv')
+
+    price_loader = PriceData()
+    price_loader.client = UnusedClient()
+    with pytest.raises(ValueError, match='price history of one symbol'):
+        price_loader.save_current_data(file_path=str(tmp_path), format='ohlcv')
+    assert list(tmp_path.iterdir()) == []
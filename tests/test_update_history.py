@@ -0,0 +1,17 @@
+#!/usr/bin/env python
+
+__author__ = "Sk Farhad"
+__copyright__ = "Copyright (c) 2024 The Python Packaging Authority"
+
+import pytest
+
+from stocksurferbd_pkg import PriceData
+
+
+@pytest.mark.parametrize('market, rows', [('DSE', 250), ('CSE', 120)])
+def test_update_returns_the_saved_rows(fixture_client, tmp_path, market, rows):
+    loader = PriceData(client=fixture_client)
+    kwargs = dict(file_path=str(tmp_path), file_name='ACI.xlsx', market=market)
+    # a missing file is saved in full
+    assert loader.update_history_data('ACI', **kwargs) == rows
+    assert loader.update_history_data('ACI', **kwargs) == 0